@@ -1,12 +1,30 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import requests
 from datetime import datetime
+import os
 import time
-import random
 import pytz
-import re
+
+from archive import SnapshotArchive
+from classify import classification_cache_info
+from compact import widen
+from constants import LEAGUE_MAPPING
+from entries import EntryStore
+from feed import FEED_PORT, BoardFeed
+from fetcher import FETCH_MODE, BackgroundFetcher, LeagueFetcher
+from filters import FilterIndex
+from instrument import PROFILE_LOG, Profiler, mark_miss, stage
+from model import load_default_model
+from movement import LineMovementTracker
+from optimizer import MIN_LEGS, PAYOUT_TABLES, expected_value, optimize_entries, payout_vector
+from pipeline import derive_board
+from render import PAGE_SIZES, get_badge_class, page_bounds, prop_cards_html, prop_label
+from scoring import HIT_RATE_THRESHOLD, pick_probabilities
+from search import SearchIndex
+from simulator import simulate_entry
+from snapshot import SnapshotStore
+from summary import summarize_board
 
 # Page config
 st.set_page_config(
@@ -15,6 +33,10 @@ st.set_page_config(
     layout="wide"
 )
 
+# Every session reads the same board; copy-on-write keeps one session's edits
+# out of the shared frames instead of copying them up front
+pd.set_option('mode.copy_on_write', True)
+
 # Set timezone
 central_tz = pytz.timezone('US/Central')
 utc_tz = pytz.UTC
@@ -152,6 +174,15 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Seconds a cold boot waits for the first download
+FIRST_SNAPSHOT_TIMEOUT = 20
+
+# Line-mover windows in minutes
+MOVER_WINDOWS = [15, 60, 240]
+
+# Entries listed after an auto-select
+TOP_ENTRIES = 5
+
 # Initialize session state
 if 'picks' not in st.session_state:
     st.session_state.picks = []
@@ -163,257 +194,154 @@ if 'show_recommended' not in st.session_state:
     st.session_state.show_recommended = False
 if 'show_team_props' not in st.session_state:
     st.session_state.show_team_props = True
+if 'entry_type' not in st.session_state:
+    st.session_state.entry_type = 'Power'
+if 'top_entries' not in st.session_state:
+    st.session_state.top_entries = []
+if 'prop_page' not in st.session_state:
+    st.session_state.prop_page = 0
+if 'prop_filter_key' not in st.session_state:
+    st.session_state.prop_filter_key = None
+if 'profiler' not in st.session_state:
+    st.session_state.profiler = Profiler()
 
-# League mapping
-LEAGUE_MAPPING = {
-    '7': 'NBA', '192': 'NBA',
-    '8': 'NHL', '3': 'NHL',
-    '1': 'MLB', '43': 'MLB', '190': 'MLB',
-    '5': 'Tennis',
-    '6': 'Soccer', '44': 'Soccer', '45': 'Soccer',
-    '82': 'Esports', '265': 'Esports', '80': 'Esports', '84': 'Esports',
-    '121': 'Esports', '145': 'Esports', '159': 'Esports', '161': 'Esports',
-    '174': 'Esports', '176': 'Esports', '383': 'Esports',
-    '131': 'Golf',
-    '20': 'CBB', '290': 'CBB',
-    '4': 'NASCAR', '9': 'NASCAR', '22': 'NASCAR',
-    '12': 'MMA', '42': 'Boxing',
-    '284': 'Handball',
-    '288': 'Unrivaled',
-    '277': 'Curling',
-    '379': 'Olympic Hockey',
-}
-
-# ===================================================
-# TEAM MAPPINGS FOR ALL MAJOR SPORTS
-# ===================================================
-
-NBA_TEAMS = {
-    'ATL': 'Hawks', 'BOS': 'Celtics', 'BKN': 'Nets', 'CHA': 'Hornets', 'CHI': 'Bulls',
-    'CLE': 'Cavaliers', 'DAL': 'Mavericks', 'DEN': 'Nuggets', 'DET': 'Pistons', 'GSW': 'Warriors',
-    'HOU': 'Rockets', 'IND': 'Pacers', 'LAC': 'Clippers', 'LAL': 'Lakers', 'MEM': 'Grizzlies',
-    'MIA': 'Heat', 'MIL': 'Bucks', 'MIN': 'Timberwolves', 'NOP': 'Pelicans', 'NYK': 'Knicks',
-    'OKC': 'Thunder', 'ORL': 'Magic', 'PHI': '76ers', 'PHX': 'Suns', 'POR': 'Trail Blazers',
-    'SAC': 'Kings', 'SAS': 'Spurs', 'TOR': 'Raptors', 'UTA': 'Jazz', 'WAS': 'Wizards'
-}
-
-NHL_TEAMS = {
-    'ANA': 'Ducks', 'ARI': 'Coyotes', 'BOS': 'Bruins', 'BUF': 'Sabres', 'CGY': 'Flames',
-    'CAR': 'Hurricanes', 'CHI': 'Blackhawks', 'COL': 'Avalanche', 'CBJ': 'Blue Jackets',
-    'DAL': 'Stars', 'DET': 'Red Wings', 'EDM': 'Oilers', 'FLA': 'Panthers', 'LAK': 'Kings',
-    'MIN': 'Wild', 'MTL': 'Canadiens', 'NSH': 'Predators', 'NJD': 'Devils', 'NYI': 'Islanders',
-    'NYR': 'Rangers', 'OTT': 'Senators', 'PHI': 'Flyers', 'PIT': 'Penguins', 'SJS': 'Sharks',
-    'SEA': 'Kraken', 'STL': 'Blues', 'TBL': 'Lightning', 'TOR': 'Maple Leafs', 'VAN': 'Canucks',
-    'VGK': 'Golden Knights', 'WSH': 'Capitals', 'WPG': 'Jets'
-}
-
-MLB_TEAMS = {
-    'ARI': 'Diamondbacks', 'ATL': 'Braves', 'BAL': 'Orioles', 'BOS': 'Red Sox',
-    'CHC': 'Cubs', 'CIN': 'Reds', 'CLE': 'Guardians', 'COL': 'Rockies', 'CWS': 'White Sox',
-    'DET': 'Tigers', 'HOU': 'Astros', 'KC': 'Royals', 'LAA': 'Angels', 'LAD': 'Dodgers',
-    'MIA': 'Marlins', 'MIL': 'Brewers', 'MIN': 'Twins', 'NYM': 'Mets', 'NYY': 'Yankees',
-    'OAK': 'Athletics', 'PHI': 'Phillies', 'PIT': 'Pirates', 'SD': 'Padres', 'SF': 'Giants',
-    'SEA': 'Mariners', 'STL': 'Cardinals', 'TB': 'Rays', 'TEX': 'Rangers', 'TOR': 'Blue Jays',
-    'WSH': 'Nationals'
-}
-
-NFL_TEAMS = {
-    'ARI': 'Cardinals', 'ATL': 'Falcons', 'BAL': 'Ravens', 'BUF': 'Bills', 'CAR': 'Panthers',
-    'CHI': 'Bears', 'CIN': 'Bengals', 'CLE': 'Browns', 'DAL': 'Cowboys', 'DEN': 'Broncos',
-    'DET': 'Lions', 'GB': 'Packers', 'HOU': 'Texans', 'IND': 'Colts', 'JAX': 'Jaguars',
-    'KC': 'Chiefs', 'LV': 'Raiders', 'LAC': 'Chargers', 'LAR': 'Rams', 'MIA': 'Dolphins',
-    'MIN': 'Vikings', 'NE': 'Patriots', 'NO': 'Saints', 'NYG': 'Giants', 'NYJ': 'Jets',
-    'PHI': 'Eagles', 'PIT': 'Steelers', 'SF': '49ers', 'SEA': 'Seahawks', 'TB': 'Buccaneers',
-    'TEN': 'Titans', 'WAS': 'Commanders'
-}
-
-# Known player names for detection (from your working list)
-KNOWN_PLAYERS = [
-    # NBA
-    'LeBron James', 'Stephen Curry', 'Kevin Durant', 'Giannis Antetokounmpo', 'Luka Doncic',
-    'Joel Embiid', 'Nikola Jokic', 'Jayson Tatum', 'Shai Gilgeous-Alexander', 'Anthony Davis',
-    'Devin Booker', 'Donovan Mitchell', 'Trae Young', 'Zion Williamson', 'Ja Morant',
-    'Kyrie Irving', 'James Harden', 'Chris Paul', 'Kawhi Leonard', 'Paul George',
-    'Jimmy Butler', 'Bam Adebayo', 'Tyrese Haliburton', 'LaMelo Ball', 'Cade Cunningham',
-    'Victor Wembanyama', 'Chet Holmgren', 'Jalen Williams', 'Scottie Barnes', 'Evan Mobley',
-    'Paolo Banchero', 'Franz Wagner', 'Jalen Green', 'Alperen Sengun', 'Jaren Jackson Jr.',
-    'Desmond Bane', 'Dillon Brooks',
-    
-    # NHL
-    'Connor McDavid', 'Auston Matthews', 'Leon Draisaitl', 'Nathan MacKinnon', 'Nikita Kucherov',
-    'David Pastrnak', 'Sidney Crosby', 'Alex Ovechkin', 'Patrick Kane', 'Jonathan Toews',
-    'Aleksander Barkov', 'Brayden Point', 'Steven Stamkos', 'Victor Hedman', 'Andrei Vasilevskiy',
-    
-    # MLB
-    'Shohei Ohtani', 'Aaron Judge', 'Mike Trout', 'Bryce Harper', 'Mookie Betts',
-    'Freddie Freeman', 'Ronald Acuña Jr.', 'Juan Soto', 'Vladimir Guerrero Jr.', 'Fernando Tatis Jr.',
-    'Manny Machado', 'Max Scherzer', 'Justin Verlander', 'Jacob deGrom', 'Gerrit Cole',
-    'Clayton Kershaw',
-    
-    # Tennis
-    'Novak Djokovic', 'Carlos Alcaraz', 'Jannik Sinner', 'Daniil Medvedev', 'Alexander Zverev',
-    'Andrey Rublev', 'Casper Ruud', 'Stefanos Tsitsipas', 'Holger Rune', 'Taylor Fritz',
-    'Frances Tiafoe', 'Tommy Paul', 'Ben Shelton', 'Sebastian Korda', 'Nick Kyrgios',
-    'Andy Murray', 'Stan Wawrinka',
-    
-    # Golf
-    'Scottie Scheffler', 'Rory McIlroy', 'Jon Rahm', 'Xander Schauffele', 'Patrick Cantlay',
-    'Viktor Hovland', 'Ludvig Aberg', 'Max Homa', 'Tony Finau', 'Collin Morikawa',
-    'Jordan Spieth', 'Justin Thomas', 'Brooks Koepka', 'Bryson DeChambeau', 'Dustin Johnson',
-    'Cameron Smith', 'Hideki Matsuyama', 'Sungjae Im', 'Tom Kim', 'Sam Burns',
-    
-    # Soccer
-    'Lionel Messi', 'Cristiano Ronaldo', 'Erling Haaland', 'Kylian Mbappé', 'Neymar Jr',
-    'Robert Lewandowski', 'Harry Kane', 'Mohamed Salah', 'Kevin De Bruyne', 'Luka Modric',
-    'Karim Benzema', 'Vinícius Jr', 'Jude Bellingham', 'Pedri', 'Gavi', 'Jamal Musiala',
-    'Florian Wirtz', 'Bukayo Saka', 'Phil Foden'
-]
-
-def get_team_info(name, sport):
-    """Extract team information and format display name"""
-    if not name:
-        return name, None, False
-    
-    # Check if it's a quarter/half prop
-    if re.search(r'[0-9][QH]', name):
-        return f"{name} (Quarter Team Prop)", name, True
-    
-    # Check if it's a 3-letter team code
-    if len(name) == 3 and name.isupper():
-        if sport == 'NBA' and name in NBA_TEAMS:
-            return f"{name} {NBA_TEAMS[name]}", name, True
-        elif sport == 'NHL' and name in NHL_TEAMS:
-            return f"{name} {NHL_TEAMS[name]}", name, True
-        elif sport == 'MLB' and name in MLB_TEAMS:
-            return f"{name} {MLB_TEAMS[name]}", name, True
-        elif sport == 'NFL' and name in NFL_TEAMS:
-            return f"{name} {NFL_TEAMS[name]}", name, True
-        else:
-            return f"{name} Team", name, True
-    
-    # Check if it's in known players list
-    name_lower = name.lower()
-    for player in KNOWN_PLAYERS:
-        if player.lower() in name_lower:
-            return name, None, False
-    
-    # Check if it has a space (likely a player name)
-    if ' ' in name:
-        return name, None, False
-    
-    # Default: treat as team prop
-    return f"{name} (Team)", name, True
+# Rerun profiling, switched on from the sidebar debug section
+profiler = st.session_state.profiler
+profiler.configure(
+    st.session_state.get('debug_timing', False),
+    trace_memory=st.session_state.get('debug_memory', False),
+    log_path=PROFILE_LOG if st.session_state.get('debug_log', False) else None,
+)
+profiler.start_run()
 
-def get_badge_class(sport, is_team):
-    """Get badge class based on sport and whether it's a team prop"""
-    if is_team:
-        return "badge-team"
-    
-    badge_map = {
-        'NBA': 'badge-nba', 'NHL': 'badge-nhl', 'MLB': 'badge-mlb',
-        'Tennis': 'badge-tennis', 'Soccer': 'badge-soccer', 'Golf': 'badge-pga',
-        'Esports': 'badge-esports', 'CBB': 'badge-cbb', 'NASCAR': 'badge-nascar',
-        'Other': 'badge-other'
+def format_age(seconds):
+    """Format a snapshot age like 2m 05s"""
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes}m {seconds:02d}s" if minutes else f"{seconds}s"
+
+def make_pick(projection_id, row):
+    """Entry leg built from a board row"""
+    return {
+        'projection_id': projection_id,
+        'league_id': row['league_id'],
+        'emoji': row['emoji'],
+        'sport': row['sport'],
+        'player': row['player_name'],
+        'display_name': row['display_name'],
+        'team_code': row['team_code'] if pd.notna(row['team_code']) else None,
+        'game_id': row['game_id'] if pd.notna(row.get('game_id')) else None,
+        'is_team': row['is_team'],
+        'stat': row['stat_type'],
+        'line': row['line'],
+        'pick': row['recommendation'],
+        'hit_rate': row['hit_rate'],
     }
-    return badge_map.get(sport, 'badge-other')
+
+def pick_groups(pick):
+    """Keys a leg shares outcomes through: its team and its game"""
+    return tuple(
+        (kind, pick[name]) for kind, name in (('team', 'team_code'), ('game', 'game_id')) if pick.get(name) is not None
+    )
+
+@st.cache_data
+def run_simulation(probabilities, groups, directions, entry_amount, simulations, seed):
+    mark_miss('simulate')
+    return simulate_entry(probabilities, list(groups), list(directions), entry_amount, simulations, seed)
+
+@st.cache_data(max_entries=4)
+def get_board_summary(version, _board):
+    """Board counts, computed once per snapshot version"""
+    mark_miss('summary')
+    return summarize_board(_board, version)
+
+@st.cache_resource
+def get_entry_store():
+    return EntryStore()
+
+def save_entry(picks, mode, amount, changes, snapshot):
+    """Queue the current entry for the history store with the snapshot it was built from"""
+    ev = None
+    if len(picks) in PAYOUT_TABLES[mode]:
+        probabilities = pick_probabilities([p['hit_rate'] for p in picks], [p['pick'] for p in picks])
+        ev = expected_value(probabilities, payout_vector(len(picks), mode))
+    legs = [{
+        'projection_id': p['projection_id'],
+        'league_id': p.get('league_id'),
+        'sport': p['sport'],
+        'player_name': p['player'],
+        'team_code': p.get('team_code'),
+        'stat_type': p['stat'],
+        # float32 board values, widened back so graded lines compare exactly
+        'line': float(widen(p['line'])),
+        'pick': p['pick'],
+        'hit_rate': float(widen(p['hit_rate'])),
+    } for p in picks]
+    get_entry_store().add(legs, mode, amount, changes.version, snapshot.fetched_at, ev)
+
+@st.cache_resource
+def get_movement_tracker():
+    return LineMovementTracker()
+
+@st.cache_resource(max_entries=4)
+def get_filter_index(version, _board):
+    """Filter indexes, built once per snapshot version"""
+    mark_miss('filter_index')
+    return FilterIndex(_board)
+
+@st.cache_resource(max_entries=4)
+def get_search_index(version, _board):
+    """Name search index, built once per snapshot version on the first search"""
+    mark_miss('search_index')
+    return SearchIndex(_board)
 
 # API call
-@st.cache_data(ttl=300)
+@st.cache_resource
+def get_fetcher():
+    fetcher_class = LeagueFetcher if FETCH_MODE == 'leagues' else BackgroundFetcher
+    fetcher = fetcher_class(archive=SnapshotArchive())
+    # Serve the newest archived board while the first live fetch runs
+    fetcher.seed_from_archive()
+    return fetcher.start()
+
 def fetch_prizepicks_projections():
-    url = "https://api.prizepicks.com/projections"
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (iPad; CPU OS 16_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.6 Mobile/15E148 Safari/604.1',
-        'Accept': 'application/json',
-        'Referer': 'https://app.prizepicks.com/',
-    }
+    """Latest snapshot published by the background fetcher"""
+    fetcher = get_fetcher()
+    snapshot = fetcher.latest()
+    if snapshot is None:
+        # Cold boot: nothing to serve yet, so wait for the first download
+        fetcher.wait_ready(timeout=FIRST_SNAPSHOT_TIMEOUT)
+        snapshot = fetcher.latest()
+    return snapshot
+
+@st.cache_resource
+def get_snapshot_store():
+    store = SnapshotStore(derive_board)
+    # Every version reaches the tracker, whether a rerun or the feed applied it
+    tracker = get_movement_tracker()
+    store.subscribe(lambda board, changes, fetched_at: tracker.observe(board, changes, fetched_at or time.time()))
+    return store
+
+@st.cache_resource
+def get_board_feed():
+    """HTTP feed of the shared board, started once per process when PRIZEPICKS_FEED_PORT is set"""
+    feed = BoardFeed(get_fetcher(), get_snapshot_store())
     try:
-        time.sleep(0.5)
-        response = requests.get(url, headers=headers, timeout=15)
-        if response.status_code == 200:
-            return response.json()
-        return None
-    except:
-        return None
-
-@st.cache_data(ttl=300)
+        feed.start(FEED_PORT)
+    except OSError as exc:
+        feed.error = str(exc)
+    return feed
+
 def get_all_projections():
-    data = fetch_prizepicks_projections()
+    """Apply the latest payload to the shared snapshot store"""
+    with stage('fetch'):
+        snapshot = fetch_prizepicks_projections()
     
-    if not data:
-        return pd.DataFrame()
+    if snapshot is None:
+        return pd.DataFrame(), None, None
     
-    projections = []
-    league_counts = {}
-    
-    for item in data.get('data', []):
-        try:
-            attrs = item.get('attributes', {})
-            line_score = attrs.get('line_score')
-            if line_score is None:
-                continue
-            
-            player_name = (attrs.get('name') or attrs.get('description') or '').strip()
-            if not player_name:
-                continue
-            
-            league_id = 'unknown'
-            league_rel = item.get('relationships', {}).get('league', {}).get('data', {})
-            if league_rel:
-                league_id = str(league_rel.get('id', 'unknown'))
-                league_counts[league_id] = league_counts.get(league_id, 0) + 1
-            
-            sport = LEAGUE_MAPPING.get(league_id, 'Other')
-            
-            # Get team info and formatted name
-            display_name, team_code, is_team = get_team_info(player_name, sport)
-            
-            # Emoji mapping
-            emoji = {
-                'NBA': '🏀', 'NHL': '🏒', 'MLB': '⚾', 'Tennis': '🎾',
-                'Soccer': '⚽', 'Golf': '⛳', 'Esports': '🎮', 'CBB': '🏀',
-                'NASCAR': '🏎️', 'MMA': '🥊', 'Boxing': '🥊', 'Other': '🏆'
-            }.get(sport, '🏆')
-            
-            projections.append({
-                'league_id': league_id,
-                'sport': sport,
-                'emoji': emoji,
-                'player_name': player_name,
-                'display_name': display_name,
-                'team_code': team_code,
-                'is_team': is_team,
-                'line': float(line_score),
-                'stat_type': attrs.get('stat_type', 'Unknown'),
-            })
-        except:
-            continue
-    
-    st.session_state.league_counts = league_counts
-    return pd.DataFrame(projections)
-
-# Hit rate calculator
-def calculate_hit_rate(line, sport):
-    base_rates = {
-        'NBA': 0.52, 'NHL': 0.51, 'MLB': 0.53, 'Tennis': 0.50,
-        'Soccer': 0.50, 'Golf': 0.48, 'Esports': 0.52, 'CBB': 0.51,
-        'NASCAR': 0.50, 'MMA': 0.49, 'Boxing': 0.49
-    }
-    base_rate = base_rates.get(sport, 0.51)
-    
-    # More randomness for variety
-    random_factor = random.uniform(0.92, 1.08)
-    
-    if line > 30:
-        factor = 0.96
-    elif line > 20:
-        factor = 0.98
-    elif line > 10:
-        factor = 1.0
-    else:
-        factor = 1.02
-    
-    hit_rate = base_rate * factor * random_factor
-    return min(max(hit_rate, 0.35), 0.68)
+    with stage('snapshot'):
+        board, changes = get_snapshot_store().update(snapshot.frame, source_key=snapshot.fetched_at)
+    return board, changes, snapshot
 
 # Main app
 current_time = get_central_time()
@@ -426,27 +354,53 @@ with col1:
     st.markdown(f"**Last Updated:** {current_time.strftime('%I:%M:%S %p CT')}")
 with col2:
     if st.button("🔄 Refresh Data"):
-        st.cache_data.clear()
-        st.rerun()
+        # The fetcher refreshes in the background; the snapshot store diffs the new payload
+        get_fetcher().refresh_now()
+        st.toast("Refresh requested")
 
 # Load data
 with st.spinner("Loading props..."):
-    df = get_all_projections()
+    df, changes, snapshot = get_all_projections()
 
 if df.empty:
-    st.error("No data loaded")
+    error = get_fetcher().last_error
+    st.error(f"No data loaded ({error})" if error else "No data loaded")
     st.stop()
 
-# Calculate hit rates
-df['hit_rate'] = df.apply(lambda row: calculate_hit_rate(row['line'], row['sport']), axis=1)
-df['recommendation'] = df['hit_rate'].apply(lambda x: 'MORE' if x > 0.5415 else 'LESS')
-df = df.sort_values('hit_rate', ascending=False)
+# Leagues refresh on their own schedules, so the snapshot time is only that of the latest pass
+league_ages = get_fetcher().league_ages() if isinstance(get_fetcher(), LeagueFetcher) else {}
+data_age = format_age(max(league_ages.values()) if league_ages else snapshot.age)
+if league_ages and format_age(min(league_ages.values())) != data_age:
+    data_age += f" for the oldest league, {format_age(min(league_ages.values()))} for the newest"
+st.caption(f"Data age: {data_age}" + (" (archived snapshot, live fetch running)" if snapshot.source == 'archive' else ""))
+if snapshot.stale_leagues:
+    stale_names = ", ".join(LEAGUE_MAPPING.get(lid, f"League {lid}") for lid in snapshot.stale_leagues)
+    st.warning(f"Stale leagues (last refresh failed, showing earlier lines): {stale_names}")
+elif get_fetcher().last_error:
+    st.warning(f"Last refresh failed ({get_fetcher().last_error}); showing the previous board")
+
+if FEED_PORT:
+    feed = get_board_feed()
+    if feed.error:
+        st.warning(f"Board feed not started on port {FEED_PORT} ({feed.error})")
+
+if changes.version > 1:
+    st.caption(f"Snapshot v{changes.version}: {changes.describe()}")
+
+with stage('summary', cached=True):
+    summary = get_board_summary(changes.version, df)
+with stage('filter_index', cached=True):
+    filter_index = get_filter_index(changes.version, df)
 
 # Sidebar
 with st.sidebar:
     st.markdown("### ⚙️ Settings")
     num_legs = st.selectbox("Number of Legs", [6, 5, 4, 3, 2], index=0)
     st.session_state.entry_amount = st.number_input("Entry Amount ($)", 1.0, 100.0, 10.0)
+    st.session_state.entry_type = st.radio("Entry Type", list(PAYOUT_TABLES), horizontal=True)
+    entry_supported = num_legs in PAYOUT_TABLES[st.session_state.entry_type]
+    if not entry_supported:
+        st.warning(f"{st.session_state.entry_type} entries need {min(PAYOUT_TABLES[st.session_state.entry_type])}+ legs")
     
     st.markdown("---")
     st.markdown("### 🤖 Auto Features")
@@ -457,23 +411,40 @@ with st.sidebar:
     st.markdown("---")
     
     # Stats
-    player_count = len(df[df['is_team'] == False])
-    team_count = len(df[df['is_team'] == True])
-    
-    st.markdown(f"**Total Props:** {len(df):,}")
-    st.markdown(f"**Player Props:** {player_count:,}")
-    st.markdown(f"**Team Props:** {team_count:,}")
-    st.markdown(f"**MORE:** {len(df[df['recommendation']=='MORE']):,}")
-    st.markdown(f"**LESS:** {len(df[df['recommendation']=='LESS']):,}")
+    st.markdown(f"**Total Props:** {summary.total:,}")
+    st.markdown(f"**Player Props:** {summary.players:,}")
+    st.markdown(f"**Team Props:** {summary.teams:,}")
+    st.markdown(f"**MORE:** {summary.more:,}")
+    st.markdown(f"**LESS:** {summary.less:,}")
     
     # League distribution
     st.markdown("### 📊 League Distribution")
-    if 'league_counts' in st.session_state:
-        sorted_leagues = sorted(st.session_state.league_counts.items(), key=lambda x: x[1], reverse=True)[:20]
-        for league_id, count in sorted_leagues:
-            sport = LEAGUE_MAPPING.get(league_id, f'League {league_id}')
-            league_player_count = len(df[(df['league_id'] == league_id) & (df['is_team'] == False)])
-            st.write(f"**{sport}** (ID: {league_id}): {count} total ({league_player_count} players)")
+    known_leagues = summary.by_league.drop('unknown', errors='ignore').head(20)
+    for league_id, counts in known_leagues.iterrows():
+        sport = LEAGUE_MAPPING.get(league_id, f'League {league_id}')
+        st.write(f"**{sport}** (ID: {league_id}): {counts['total']} total ({counts['players']} players)")
+    
+    st.caption("Hit rates: fitted model" if load_default_model() is not None else "Hit rates: base-rate heuristic")
+    cache_info = classification_cache_info()
+    st.caption(f"Name cache: {cache_info.hits:,} hits / {cache_info.misses:,} misses ({cache_info.currsize:,} names)")
+
+# Line movement
+with st.expander("📈 Line Movers"):
+    window_minutes = st.selectbox("Window", MOVER_WINDOWS, index=1, format_func=lambda m: f"Last {m} min")
+    movers = get_movement_tracker().biggest_movers(window_minutes * 60, time.time())
+    if movers.empty:
+        st.caption("No line moves in this window yet")
+    else:
+        names = df.reindex(movers.index)
+        st.dataframe(pd.DataFrame({
+            'Prop': names['display_name'],
+            'Stat': names['stat_type'],
+            'From': movers['previous_line'],
+            'To': movers['line'],
+            'Move': movers['delta'],
+            'Direction': movers['direction'].map({1: '⬆️', -1: '⬇️'}),
+            'Minutes since change': (movers['seconds_since_change'] / 60).round(1),
+        }), hide_index=True, use_container_width=True)
 
 # Main content
 col_left, col_right = st.columns([1.3, 0.7])
@@ -485,7 +456,7 @@ with col_left:
     st.markdown('<div class="team-note">🏷️ Orange badges = Team Props | Blue badges = Player Props</div>', unsafe_allow_html=True)
     
     # League filter
-    all_leagues = sorted(df['league_id'].unique())
+    all_leagues = filter_index.leagues
     league_options = {lid: f"{LEAGUE_MAPPING.get(lid, f'League {lid}')} (ID: {lid})" for lid in all_leagues}
     selected_leagues = st.multiselect(
         "Select Leagues",
@@ -493,77 +464,94 @@ with col_left:
         format_func=lambda x: league_options[x],
         default=[]
     )
+    # In per-league fetch mode leagues being shown refresh faster than the rest
+    get_fetcher().watch(selected_leagues)
+    
+    search_query = st.text_input("🔍 Search players, teams or stats", placeholder="e.g. acuna, LAL points")
     
     # Apply filters
-    filtered_df = df.copy()
-    if selected_leagues:
-        filtered_df = filtered_df[filtered_df['league_id'].isin(selected_leagues)]
+    filter_args = dict(
+        leagues=selected_leagues,
+        include_teams=st.session_state.show_team_props,
+        recommended_only=st.session_state.show_recommended,
+    )
+    with stage('filter'):
+        positions = filter_index.positions(**filter_args)
+    if search_query.strip():
+        with stage('search_index', cached=True):
+            search_index = get_search_index(changes.version, df)
+        with stage('search'):
+            # Best matches first, restricted to the rows the filters keep
+            matches = search_index.search(search_query, limit=None)
+            allowed = np.zeros(len(df), dtype=bool)
+            allowed[positions] = True
+            positions = matches[allowed[matches]]
+    
+    shown_teams = int(df['is_team'].to_numpy()[positions].sum())
+    st.caption(f"**Showing {len(positions)} props ({len(positions) - shown_teams} players, {shown_teams} teams)**")
     
-    if not st.session_state.show_team_props:
-        filtered_df = filtered_df[filtered_df['is_team'] == False]
+    # Auto-select
+    if st.session_state.auto_select and entry_supported and len(st.session_state.picks) == 0 and len(positions) >= num_legs:
+        if st.button("🤖 Auto-select best picks"):
+            with stage('optimize'):
+                st.session_state.top_entries = optimize_entries(
+                    df.take(positions), num_legs, st.session_state.entry_type, top_k=TOP_ENTRIES
+                )
+            if st.session_state.top_entries:
+                best_ids = list(st.session_state.top_entries[0].projection_ids)
+                st.session_state.picks = [make_pick(pid, row) for pid, row in df.loc[best_ids].iterrows()]
+            st.rerun()
     
-    if st.session_state.show_recommended:
-        filtered_df = filtered_df[filtered_df['hit_rate'] > 0.5415]
+    # Top entries from the last auto-select
+    live_entries = [e for e in st.session_state.top_entries if all(pid in df.index for pid in e.projection_ids)]
+    if live_entries:
+        with st.expander(f"🏆 Top {len(live_entries)} {st.session_state.entry_type} entries"):
+            for i, entry in enumerate(live_entries):
+                legs = df.loc[list(entry.projection_ids)]
+                st.markdown(f"**#{i + 1}** EV {entry.ev * 100:+.1f}% | all hit {entry.win_probability * 100:.1f}%")
+                st.caption(" · ".join(f"{name} {rec}" for name, rec in zip(legs['display_name'], legs['recommendation'])))
+                if st.button("Use this entry", key=f"use_entry_{i}"):
+                    st.session_state.picks = [make_pick(pid, row) for pid, row in legs.iterrows()]
+                    st.rerun()
     
-    st.caption(f"**Showing {len(filtered_df)} props ({len(filtered_df[filtered_df['is_team']==False])} players, {len(filtered_df[filtered_df['is_team']==True])} teams)**")
+    # Back to the first page whenever the filters change
+    filter_key = (tuple(selected_leagues), st.session_state.show_team_props, st.session_state.show_recommended, search_query)
+    if st.session_state.prop_filter_key != filter_key:
+        st.session_state.prop_filter_key = filter_key
+        st.session_state.prop_page = 0
     
-    # Auto-select
-    if st.session_state.auto_select and len(st.session_state.picks) == 0 and len(filtered_df) >= num_legs:
-        if st.button("🤖 Auto-select best picks"):
-            for _, row in filtered_df.head(num_legs).iterrows():
-                st.session_state.picks.append({
-                    'emoji': row['emoji'],
-                    'sport': row['sport'],
-                    'player': row['player_name'],
-                    'display_name': row['display_name'],
-                    'is_team': row['is_team'],
-                    'stat': row['stat_type'],
-                    'line': row['line'],
-                    'pick': row['recommendation'],
-                    'hit_rate': row['hit_rate'],
-                })
+    page_size = st.selectbox("Props per page", PAGE_SIZES, index=0)
+    page, pages, start, stop = page_bounds(len(positions), st.session_state.prop_page, page_size)
+    page_df = df.take(positions[start:stop])
+    
+    nav_prev, nav_info, nav_next = st.columns([1, 2, 1])
+    with nav_prev:
+        if st.button("◀ Prev", disabled=page == 0):
+            st.session_state.prop_page = page - 1
+            st.rerun()
+    with nav_info:
+        st.caption(f"Page {page + 1} of {pages} ({start + 1 if stop else 0}-{stop} of {len(positions)})")
+    with nav_next:
+        if st.button("Next ▶", disabled=page >= pages - 1):
+            st.session_state.prop_page = page + 1
             st.rerun()
     
     # Display props
-    for idx, row in filtered_df.head(30).iterrows():
-        with st.container():
-            badge_class = get_badge_class(row['sport'], row['is_team'])
-            
-            st.markdown(f"""
-            <div class='prop-card'>
-                <div style='display: flex; justify-content: space-between; align-items: center;'>
-                    <div>
-                        <span style='font-size:1.2rem;'>{row['emoji']}</span>
-                        <span style='font-weight:bold; font-size:1.1rem;'>{row['display_name']}</span>
-                        <span class='{badge_class}'>{row['sport']}{' TEAM' if row['is_team'] else ''}</span>
-                    </div>
-                    <span style='font-weight:bold; color:{"#2E7D32" if row["hit_rate"]>0.5415 else "#C62828"};'>
-                        {row['hit_rate']*100:.1f}%
-                    </span>
-                </div>
-                <div class='stat-line'>{row['stat_type']}: {row['line']:.1f}</div>
-                <div style='display:flex; gap:10px; align-items:center; margin-top:8px;'>
-                    <span class='{"more-badge" if row["recommendation"]=="MORE" else "less-badge"}'>
-                        {row['recommendation']}
-                    </span>
-            """, unsafe_allow_html=True)
-            
-            if st.button("➕ Add", key=f"add_{idx}"):
-                if len(st.session_state.picks) < num_legs:
-                    st.session_state.picks.append({
-                        'emoji': row['emoji'],
-                        'sport': row['sport'],
-                        'player': row['player_name'],
-                        'display_name': row['display_name'],
-                        'is_team': row['is_team'],
-                        'stat': row['stat_type'],
-                        'line': row['line'],
-                        'pick': row['recommendation'],
-                        'hit_rate': row['hit_rate'],
-                    })
-                    st.rerun()
-            
-            st.markdown('</div>', unsafe_allow_html=True)
+    with stage('render'):
+        st.markdown(prop_cards_html(page_df), unsafe_allow_html=True)
+    
+    # Add picks from the current page
+    with st.form("add_picks", clear_on_submit=True):
+        page_labels = {pid: prop_label(row) for pid, row in zip(page_df.index, page_df.to_dict('records'))}
+        chosen = st.multiselect("Add props from this page", options=list(page_labels), format_func=page_labels.get)
+        if st.form_submit_button("➕ Add selected"):
+            already_picked = {pick.get('projection_id') for pick in st.session_state.picks}
+            for pid in chosen:
+                if len(st.session_state.picks) >= num_legs:
+                    break
+                if pid not in already_picked:
+                    st.session_state.picks.append(make_pick(pid, page_df.loc[pid]))
+            st.rerun()
 
 with col_right:
     st.markdown('<p class="section-header">📝 Your Entry</p>', unsafe_allow_html=True)
@@ -586,7 +574,7 @@ with col_right:
                         </span>
                     </div>
                     <div>{pick['stat']} {pick['line']:.1f}</div>
-                    <div style='color:{"#2E7D32" if pick["hit_rate"]>0.5415 else "#C62828"}; margin-top:5px;'>
+                    <div style='color:{"#2E7D32" if pick["hit_rate"]>HIT_RATE_THRESHOLD else "#C62828"}; margin-top:5px;'>
                         Hit rate: {pick['hit_rate']*100:.1f}%
                     </div>
                 """, unsafe_allow_html=True)
@@ -597,6 +585,28 @@ with col_right:
                 
                 st.markdown('</div>', unsafe_allow_html=True)
         
+        # Payout simulation
+        if len(st.session_state.picks) >= MIN_LEGS:
+            with st.expander("🎲 Simulate payouts"):
+                sim_col1, sim_col2 = st.columns(2)
+                simulations = sim_col1.selectbox("Simulations", [100_000, 1_000_000, 5_000_000], index=1, format_func=lambda n: f"{n:,}")
+                seed = sim_col2.number_input("Seed", 0, 2**31 - 1, 42)
+                picks = st.session_state.picks
+                with stage('simulate', cached=True):
+                    results = run_simulation(
+                        tuple(pick_probabilities([p['hit_rate'] for p in picks], [p['pick'] for p in picks])),
+                        tuple(pick_groups(p) for p in picks),
+                        tuple(1 if p['pick'] == 'MORE' else -1 for p in picks),
+                        st.session_state.entry_amount, simulations, int(seed),
+                    )
+                for mode, result in results.items():
+                    st.markdown(f"**{mode}:** EV ${result.ev:+.2f} | Profit {result.prob_profit * 100:.1f}% of the time")
+                    st.caption(" | ".join(f"p{q}: ${value:.2f}" for q, value in result.percentiles.items()))
+        
+        if len(st.session_state.picks) >= MIN_LEGS and st.button("💾 Save entry"):
+            save_entry(st.session_state.picks, st.session_state.entry_type, st.session_state.entry_amount, changes, snapshot)
+            st.toast("Entry saved to history")
+
         if st.button("🗑️ Clear All", type="primary"):
             st.session_state.picks = []
             st.rerun()
@@ -607,10 +617,30 @@ with col_right:
 st.markdown("---")
 st.markdown(f"""
 <div class='footer'>
-    <p>🏀 {len(df):,} total props | 
-    <span style='color:#2E7D32;'>{len(df[df['recommendation']=='MORE']):,} MORE</span> / 
-    <span style='color:#C62828;'>{len(df[df['recommendation']=='LESS']):,} LESS</span>
+    <p>🏀 {summary.total:,} total props | 
+    <span style='color:#2E7D32;'>{summary.more:,} MORE</span> / 
+    <span style='color:#C62828;'>{summary.less:,} LESS</span>
     </p>
     <p style='font-size:0.8rem;'>🟠 Orange badges = Team props | 🔵 Colored badges = Player props</p>
 </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
+
+# Debug timings, drawn last so they include this rerun
+profiler.finish_run()
+with st.sidebar:
+    with st.expander("🛠️ Debug: rerun timings"):
+        st.checkbox("Time each stage", key='debug_timing')
+        st.checkbox("Track peak memory (tracemalloc)", key='debug_memory', disabled=not profiler.enabled)
+        st.checkbox(f"Append runs to {os.path.basename(PROFILE_LOG)}", key='debug_log', disabled=not profiler.enabled)
+        if profiler.runs:
+            st.caption(f"Rolling p50/p95 over the last {len(profiler.durations['total'])} reruns")
+            st.dataframe(profiler.stats().round(2), hide_index=True, use_container_width=True)
+            if st.button("Reset timings"):
+                profiler.reset()
+        elif profiler.enabled:
+            st.caption("Timings appear after the next rerun")
+    if isinstance(get_fetcher(), LeagueFetcher):
+        with st.expander("🛠️ Debug: refresh schedule"):
+            fetcher = get_fetcher()
+            st.caption(f"{fetcher.scheduler.spent():,} of {fetcher.scheduler.budget:,} requests used in the last hour")
+            st.dataframe(fetcher.schedule(), hide_index=True, use_container_width=True)
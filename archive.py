@@ -0,0 +1,149 @@
+import gzip
+import json
+import os
+import shutil
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from compact import widen
+
+ARCHIVE_DIR = os.environ.get(
+    'PRIZEPICKS_ARCHIVE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'archive')
+)
+
+# Days of snapshots kept on disk
+KEEP_DAYS = 14
+
+META_FILE = 'meta.json'
+DICTIONARY_FILE = 'dictionaries.json.gz'
+
+# Numeric columns stored narrower than they are held in memory; float32 is
+# widened back to float64 on load by the same rule as the compact board
+NARROW_DTYPES = {'float64': 'float32'}
+
+
+def _code_dtype(size):
+    """Smallest unsigned dtype that can index a dictionary of this size"""
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if size <= np.iinfo(dtype).max:
+            return dtype
+    return np.uint64
+
+
+class SnapshotArchive:
+    """Append-only on-disk archive of raw projection snapshots.
+
+    Each snapshot is a directory of one .npy file per column under a
+    per-day folder. String columns are dictionary-encoded into the
+    narrowest unsigned code type, with the gzip-compressed dictionaries
+    stored alongside; numeric columns are narrowed (float32 lines). Column
+    files are memory-mapped on read, so loading never re-parses JSON.
+    """
+
+    def __init__(self, root=ARCHIVE_DIR, keep_days=KEEP_DAYS):
+        self.root = root
+        self.keep_days = keep_days
+
+    def append(self, frame, fetched_at=None):
+        """Write one snapshot and return its directory"""
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        stamp = datetime.fromtimestamp(fetched_at, timezone.utc)
+        day_dir = os.path.join(self.root, stamp.strftime('%Y-%m-%d'))
+        final_dir = os.path.join(day_dir, f"{int(fetched_at * 1000):d}")
+        tmp_dir = final_dir + '.tmp'
+        os.makedirs(tmp_dir, exist_ok=True)
+
+        columns = {}
+        dictionaries = {}
+        for name in frame.columns:
+            series = frame[name]
+            if series.dtype == object or isinstance(series.dtype, pd.CategoricalDtype) or pd.api.types.is_string_dtype(series.dtype):
+                codes, uniques = pd.factorize(series, use_na_sentinel=True)
+                # Missing values take the slot after the last dictionary entry
+                dictionary = [None if pd.isna(u) else str(u) for u in uniques] + [None]
+                codes = np.where(codes < 0, len(uniques), codes).astype(_code_dtype(len(dictionary)))
+                dictionaries[name] = dictionary
+                values = codes
+                kind = 'dictionary'
+            else:
+                values = series.to_numpy()
+                if values.dtype.kind == 'M':
+                    values = values.astype('datetime64[ns]').view(np.int64)
+                    kind = 'datetime'
+                else:
+                    values = values.astype(NARROW_DTYPES.get(values.dtype.name, values.dtype))
+                    kind = 'numeric'
+            np.save(os.path.join(tmp_dir, f'{name}.npy'), np.ascontiguousarray(values))
+            columns[name] = {'kind': kind, 'dtype': series.dtype.name}
+
+        with gzip.open(os.path.join(tmp_dir, DICTIONARY_FILE), 'wt', encoding='utf-8') as f:
+            json.dump(dictionaries, f, ensure_ascii=False)
+        with open(os.path.join(tmp_dir, META_FILE), 'w', encoding='utf-8') as f:
+            json.dump({'fetched_at': fetched_at, 'rows': len(frame), 'columns': columns}, f)
+
+        # Readers only ever see complete snapshots
+        os.replace(tmp_dir, final_dir)
+        return final_dir
+
+    def snapshots(self, day=None):
+        """(fetched_at, path) for archived snapshots, oldest first"""
+        if not os.path.isdir(self.root):
+            return []
+        days = [day] if day else sorted(os.listdir(self.root))
+        found = []
+        for name in days:
+            day_dir = os.path.join(self.root, name)
+            if not os.path.isdir(day_dir):
+                continue
+            for entry in os.listdir(day_dir):
+                if entry.isdigit():
+                    found.append((int(entry) / 1000, os.path.join(day_dir, entry)))
+        return sorted(found)
+
+    def load(self, path, mmap=True):
+        """Read one snapshot back as (fetched_at, frame)"""
+        with open(os.path.join(path, META_FILE), encoding='utf-8') as f:
+            meta = json.load(f)
+        with gzip.open(os.path.join(path, DICTIONARY_FILE), 'rt', encoding='utf-8') as f:
+            dictionaries = json.load(f)
+
+        data = {}
+        for name, info in meta['columns'].items():
+            values = np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r' if mmap else None)
+            if info['kind'] == 'dictionary':
+                data[name] = np.array(dictionaries[name], dtype=object)[values]
+            elif info['kind'] == 'datetime':
+                data[name] = np.asarray(values).view('datetime64[ns]')
+            elif values.dtype.name != info['dtype'] and values.dtype.kind == 'f':
+                data[name] = widen(values)
+            else:
+                data[name] = np.asarray(values).astype(info['dtype'], copy=False)
+        return meta['fetched_at'], pd.DataFrame(data)
+
+    def latest(self):
+        """Newest archived snapshot as (fetched_at, frame), or None"""
+        found = self.snapshots()
+        if not found:
+            return None
+        return self.load(found[-1][1])
+
+    def load_day(self, day):
+        """Every snapshot of a day stacked, with a fetched_at column"""
+        frames = []
+        for fetched_at, path in self.snapshots(day):
+            _, frame = self.load(path)
+            frames.append(frame.assign(fetched_at=fetched_at))
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def prune(self, now=None):
+        """Drop day folders older than keep_days"""
+        if not os.path.isdir(self.root):
+            return
+        now = time.time() if now is None else now
+        cutoff = datetime.fromtimestamp(now - self.keep_days * 86400, timezone.utc).strftime('%Y-%m-%d')
+        for name in os.listdir(self.root):
+            if name < cutoff and os.path.isdir(os.path.join(self.root, name)):
+                shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
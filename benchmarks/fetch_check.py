@@ -0,0 +1,144 @@
+"""Check the per-league fetcher against the mock API.
+
+    python -m benchmarks.fetch_check
+
+Covers page-number and links.next paging (with items the ingest skips
+on every page), a server that ignores page, a league answered with 503
+keeping its last good rows as a stale league, and a failing league left
+alone until its Retry-After is up however often it is viewed. Prints
+one line per check and exits 1 if any fails.
+"""
+import argparse
+import sys
+import time
+
+from benchmarks.mock_server import MockBoard, serve
+from benchmarks.synthetic import generate_payload
+from fetcher import LeagueFetcher, fetch_league, make_session
+
+PER_PAGE = 50
+RETRY_AFTER = 120
+
+
+def _board(items, seed, **switches):
+    """MockBoard whose every PER_PAGE-th item has no line, so ingest skips it"""
+    payload = generate_payload(items, seed)
+    for i, item in enumerate(payload['data']):
+        if i % PER_PAGE == 0:
+            item['attributes'].pop('line_score')
+    return MockBoard(payload, **switches)
+
+
+def _largest_leagues(board, count):
+    by_size = sorted((league_id for league_id in board.by_league if league_id), key=lambda l: -len(board.by_league[l]))
+    return by_size[:count]
+
+
+def _expected(board, league_id):
+    return {item['id'] for item in board.by_league[league_id] if 'line_score' in item['attributes']}
+
+
+def check_paging(items, seed, links):
+    board = _board(items, seed, links=links)
+    server = serve(board)
+    try:
+        league_id = _largest_leagues(board, 1)[0]
+        url = f"http://127.0.0.1:{server.server_port}/projections"
+        frame, pages = fetch_league(make_session(), url, league_id, PER_PAGE)
+    finally:
+        server.shutdown()
+    total = len(board.by_league[league_id])
+    assert total > 2 * PER_PAGE, f"league {league_id} has only {total} items"
+    assert set(frame['projection_id']) == _expected(board, league_id), 'rows lost across pages'
+    assert pages == -(-total // PER_PAGE), f"{pages} pages for {total} items"
+
+
+def check_ignored_page(items, seed):
+    board = _board(items, seed, links=False, ignore_page=True)
+    server = serve(board)
+    try:
+        league_id = _largest_leagues(board, 1)[0]
+        url = f"http://127.0.0.1:{server.server_port}/projections"
+        frame, pages = fetch_league(make_session(), url, league_id, PER_PAGE)
+    finally:
+        server.shutdown()
+    first = {item['id'] for item in board.by_league[league_id][:PER_PAGE] if 'line_score' in item['attributes']}
+    assert pages == 2, f"{pages} pages requested"
+    assert set(frame['projection_id']) == first, 'repeated page was kept'
+
+
+def check_stale_league(items, seed):
+    board = _board(items, seed)
+    server = serve(board)
+    try:
+        healthy, failing = _largest_leagues(board, 2)
+        url = f"http://127.0.0.1:{server.server_port}/projections"
+        fetcher = LeagueFetcher(url, leagues=[healthy, failing], per_page=PER_PAGE)
+        fetcher.refresh_once()
+        first = fetcher.latest()
+        assert first.stale_leagues == (), f"stale after a clean pass: {first.stale_leagues}"
+
+        board.fail.add(failing)
+        fetcher.scheduler.expire([healthy, failing])
+        fetcher.refresh_once()
+        second = fetcher.latest()
+    finally:
+        server.shutdown()
+    assert second is not first, 'nothing published after a partial failure'
+    assert second.stale_leagues == (failing,), f"stale leagues {second.stale_leagues}"
+    assert failing in fetcher.league_errors, 'failure not recorded'
+    held = set(second.frame.loc[second.frame['league_id'] == failing, 'projection_id'])
+    assert held == _expected(board, failing), 'failing league lost its rows'
+
+
+def check_backoff(items, seed):
+    board = _board(items, seed, retry_after=RETRY_AFTER)
+    server = serve(board)
+    try:
+        healthy, failing = _largest_leagues(board, 2)
+        board.fail.add(failing)
+        url = f"http://127.0.0.1:{server.server_port}/projections"
+        fetcher = LeagueFetcher(url, leagues=[healthy, failing], per_page=PER_PAGE)
+        started = time.time()
+        fetcher.refresh_once()
+        # Every rerun of a session showing the failing league watches it again
+        for _ in range(5):
+            fetcher.watch([failing])
+            fetcher.refresh_once()
+    finally:
+        server.shutdown()
+    state = fetcher.scheduler.states[failing]
+    assert board.league_requests.get(failing) == 1, f"failing league requested {board.league_requests.get(failing)} times"
+    assert state.failures == 1, f"{state.failures} failures recorded"
+    assert state.retry_at >= started + RETRY_AFTER, f"retry in {state.retry_at - started:.0f}s, not {RETRY_AFTER}s"
+
+
+CHECKS = {
+    'page numbers': lambda items, seed: check_paging(items, seed, links=False),
+    'links.next': lambda items, seed: check_paging(items, seed, links=True),
+    'ignored page': check_ignored_page,
+    'stale league': check_stale_league,
+    'backoff kept': check_backoff,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, default=5_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for name, check in CHECKS.items():
+        try:
+            check(args.items, args.seed)
+        except AssertionError as exc:
+            failed += 1
+            print(f"FAIL  {name}: {exc}")
+        else:
+            print(f"ok    {name}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""Local stand-in for the projections API serving a synthetic board.
+
+    python -m benchmarks.mock_server --items 20000 --port 8765
+    python -m benchmarks.mock_server --fail 7 --delay 9=5
+
+Point the app at it with
+PRIZEPICKS_PROJECTIONS_URL=http://127.0.0.1:8765/projections. Requests
+with league_id are paged (page, per_page) and carry links.next unless
+--no-links; --fail answers a league with 503 (with --retry-after as its
+Retry-After), --delay stalls it and --ignore-page sends the first page
+whatever page is asked for.
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from benchmarks.synthetic import generate_payload
+
+DEFAULT_PORT = 8765
+
+
+class MockBoard:
+    """A synthetic payload split by league, with failure, delay and paging switches"""
+
+    def __init__(self, payload, fail=(), delays=None, links=True, ignore_page=False, retry_after=None):
+        self.payload = payload
+        self.fail = set(fail)
+        self.retry_after = retry_after
+        self.delays = dict(delays or {})
+        self.links = links
+        self.ignore_page = ignore_page
+        self.requests = 0
+        self.league_requests = {}
+        self._lock = threading.Lock()
+        self.by_league = {}
+        for item in payload['data']:
+            league = (item['relationships'].get('league') or {}).get('data')
+            self.by_league.setdefault(league['id'] if league else None, []).append(item)
+        self.included = {(r['type'], r['id']): r for r in payload['included']}
+
+    def count(self, league_id=None):
+        with self._lock:
+            self.requests += 1
+            self.league_requests[league_id] = self.league_requests.get(league_id, 0) + 1
+
+    def page(self, league_id, page, per_page, base_url):
+        """One page of a league's projections with the resources it references"""
+        items = self.by_league.get(league_id, [])
+        if self.ignore_page:
+            page = 1
+        start = (page - 1) * per_page
+        data = items[start:start + per_page]
+        keys = {('league', league_id)}
+        for item in data:
+            for rel in item['relationships'].values():
+                keys.add((rel['data']['type'], rel['data']['id']))
+        links = {}
+        if self.links and start + per_page < len(items):
+            links['next'] = f"{base_url}?{urlencode({'league_id': league_id, 'page': page + 1, 'per_page': per_page})}"
+        included = [self.included[key] for key in keys if key in self.included]
+        return {'data': data, 'included': included, 'links': links, 'meta': {'total': len(items)}}
+
+
+def make_handler(board):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            league_id = query.get('league_id')
+            board.count(league_id)
+
+            if league_id in board.delays:
+                time.sleep(board.delays[league_id])
+            if league_id in board.fail:
+                self.send_response(503)
+                if board.retry_after is not None:
+                    self.send_header('Retry-After', str(board.retry_after))
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+
+            if league_id is None:
+                body = board.payload
+            else:
+                base_url = f"http://{self.headers.get('Host')}{url.path}"
+                body = board.page(league_id, int(query.get('page', 1)), int(query.get('per_page', 250)), base_url)
+            data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            try:
+                self.wfile.write(data)
+            except (BrokenPipeError, ConnectionResetError):
+                # The client gave up, e.g. on its own timeout
+                pass
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def serve(board, port=0, host='127.0.0.1'):
+    """Start the mock API on a daemon thread and return the server"""
+    server = ThreadingHTTPServer((host, port), make_handler(board))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='mock-api', daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--items', type=int, default=10_000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--fail', nargs='*', default=[], help='league ids answered with 503')
+    parser.add_argument('--delay', nargs='*', default=[], help='LEAGUE=SECONDS stalls')
+    parser.add_argument('--no-links', action='store_true', help='leave links.next out of pages')
+    parser.add_argument('--ignore-page', action='store_true', help='answer every page with the first')
+    parser.add_argument('--retry-after', type=int, help='Retry-After seconds sent with failures')
+    args = parser.parse_args(argv)
+
+    delays = {league_id: float(seconds) for league_id, seconds in (d.split('=', 1) for d in args.delay)}
+    board = MockBoard(generate_payload(args.items, args.seed), args.fail, delays, not args.no_links, args.ignore_page,
+                      args.retry_after)
+    server = serve(board, args.port)
+    print(f"Serving {args.items:,} projections at http://127.0.0.1:{server.server_port}/projections", file=sys.stderr)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""Check the entry optimizer against exhaustive search.
+
+    python -m benchmarks.optimizer_check
+
+Covers boards the player and team limits make infeasible, which must come
+back empty at once, and small random boards, whose entries must match
+every combination scored by hand. Prints one line per check and exits 1
+if any fails.
+"""
+import argparse
+import itertools
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from optimizer import expected_value, optimize_entries, payout_vector
+from scoring import pick_probabilities
+
+# An infeasible board has to be rejected well inside this
+INFEASIBLE_SECONDS = 1.0
+
+
+def _board(rng, size, players, teams):
+    return pd.DataFrame({
+        'hit_rate': rng.uniform(0.3, 0.7, size),
+        'recommendation': rng.choice(['MORE', 'LESS'], size),
+        'player_name': rng.choice([f"Player {i}" for i in range(players)], size),
+        'team_code': pd.Categorical(rng.choice(teams, size)),
+    }, index=[f"p{i}" for i in range(size)])
+
+
+def _exhaustive(board, num_legs, top_k, max_per_team):
+    """EVs of the best entries found by scoring every combination"""
+    payout = payout_vector(num_legs)
+    probs = pick_probabilities(board['hit_rate'].to_numpy(), board['recommendation'].to_numpy())
+    players = board['player_name'].to_numpy()
+    teams = board['team_code'].astype(object).to_numpy()
+    evs = []
+    for combo in itertools.combinations(range(len(board)), num_legs):
+        if len({players[i] for i in combo}) < num_legs:
+            continue
+        counts = pd.Series([teams[i] for i in combo]).value_counts()
+        if len(counts) and counts.max() > max_per_team:
+            continue
+        evs.append(expected_value(probs[list(combo)], payout))
+    return sorted(evs, reverse=True)[:top_k]
+
+
+def check_infeasible(seed):
+    rng = np.random.default_rng(seed)
+    cases = {
+        # One game, two teams: at most 4 legs under the default limit of 2
+        'two teams': (_board(rng, 200, 200, ['AAA', 'BBB']), 6),
+        'five players': (_board(rng, 150, 5, ['AAA', 'BBB', 'CCC', 'DDD']), 6),
+    }
+    for name, (board, num_legs) in cases.items():
+        started = time.perf_counter()
+        entries = optimize_entries(board, num_legs)
+        elapsed = time.perf_counter() - started
+        assert entries == [], f"{name}: {len(entries)} entries"
+        assert elapsed < INFEASIBLE_SECONDS, f"{name}: took {elapsed:.1f}s"
+
+
+def check_exhaustive(seed, boards=200):
+    rng = np.random.default_rng(seed)
+    for _ in range(boards):
+        board = _board(rng, int(rng.integers(4, 14)), int(rng.integers(2, 9)), ['AAA', 'BBB', 'CCC', None])
+        num_legs, top_k, max_per_team = int(rng.integers(2, 7)), int(rng.integers(1, 6)), int(rng.integers(1, 4))
+        found = [entry.ev for entry in optimize_entries(board, num_legs, top_k=top_k, max_per_team=max_per_team)]
+        expected = _exhaustive(board, num_legs, top_k, max_per_team)
+        assert np.allclose(found, expected), f"{num_legs} legs, top {top_k}, {max_per_team} per team: {found} != {expected}"
+
+
+CHECKS = {
+    'infeasible limits': check_infeasible,
+    'matches exhaustive search': check_exhaustive,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for name, check in CHECKS.items():
+        try:
+            check(args.seed)
+        except AssertionError as exc:
+            failed += 1
+            print(f"FAIL  {name}: {exc}")
+        else:
+            print(f"ok    {name}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""Time every pipeline stage on synthetic boards.
+
+    python -m benchmarks.run --sizes 1000 10000 200000
+    python -m benchmarks.run --save-baseline
+    python -m benchmarks.run --baseline benchmarks/baseline.json
+
+Each stage is timed (best of --repeat) and then run once more under
+tracemalloc for its peak allocation. With --baseline, stages that got
+slower than --tolerance are reported and the exit status is 1.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+from benchmarks.synthetic import payload_bytes
+from classify import classify_props, get_team_info
+from constants import DEFAULT_EMOJI, LEAGUE_MAPPING, SPORT_EMOJI
+from filters import FilterIndex
+from ingest import ingest_stream
+from optimizer import optimize_entries
+from scoring import score_projections
+from search import SearchIndex
+from summary import summarize_board
+
+DEFAULT_SIZES = [1_000, 10_000, 50_000, 200_000]
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+CHUNK_SIZE = 65536
+
+# A stage is a regression when it is this much slower than the baseline
+DEFAULT_TOLERANCE = 1.25
+
+
+def _chunks(body):
+    return (body[i:i + CHUNK_SIZE] for i in range(0, len(body), CHUNK_SIZE))
+
+
+def stage_ingest(ctx):
+    ctx['raw'] = ingest_stream(_chunks(ctx['body'])).set_index('projection_id')
+
+
+def stage_classify(ctx):
+    # Cold cache: every distinct name is classified again
+    get_team_info.cache_clear()
+    raw = ctx['raw']
+    sport = raw['league_id'].map(LEAGUE_MAPPING).fillna('Other')
+    # The join path derive_board takes: resolved teams first, name heuristics for the rest
+    display_name, team_code, is_team = classify_props(raw['player_name'], sport, raw.get('team'), raw.get('position'))
+    ctx['classified'] = raw.assign(
+        sport=sport, emoji=sport.map(SPORT_EMOJI).fillna(DEFAULT_EMOJI),
+        display_name=display_name, team_code=team_code, is_team=is_team,
+    )
+
+
+def stage_score(ctx):
+    ctx['board'] = score_projections(ctx['classified'])
+
+
+def stage_filter(ctx):
+    index = FilterIndex(ctx['board'])
+    leagues = index.leagues[:3]
+    for args in ((None, True, False), (leagues, True, False), (leagues, False, True)):
+        index.positions(*args)
+    ctx['filter_index'] = index
+
+
+def stage_summary(ctx):
+    ctx['summary'] = summarize_board(ctx['board'])
+
+
+def stage_search(ctx):
+    index = SearchIndex(ctx['board'])
+    for query in ('a', 'acuna jr', 'lal points', 'kills'):
+        index.search(query)
+    ctx['search_index'] = index
+
+
+def stage_entries(ctx):
+    ctx['entries'] = optimize_entries(ctx['board'], 6, 'Power', top_k=10)
+
+
+STAGES = [
+    ('ingest', stage_ingest),
+    ('classify', stage_classify),
+    ('score', stage_score),
+    ('filter', stage_filter),
+    ('summary', stage_summary),
+    ('search', stage_search),
+    ('entries', stage_entries),
+]
+
+
+def run_size(n_items, repeat, seed):
+    """Seconds and peak bytes per stage for one board size"""
+    ctx = {'body': payload_bytes(n_items, seed)}
+    results = {}
+    for name, stage in STAGES:
+        best = float('inf')
+        for _ in range(repeat):
+            started = time.perf_counter()
+            stage(ctx)
+            best = min(best, time.perf_counter() - started)
+
+        tracemalloc.start()
+        stage(ctx)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[name] = {'seconds': best, 'peak_bytes': peak}
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """(size, stage, ratio) for stages slower than the baseline by more than tolerance"""
+    regressions = []
+    for size, stages in results.items():
+        for stage, numbers in stages.items():
+            base = baseline.get(size, {}).get(stage)
+            if not base or not base['seconds']:
+                continue
+            ratio = numbers['seconds'] / base['seconds']
+            if ratio > tolerance:
+                regressions.append((size, stage, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write results as JSON')
+    parser.add_argument('--baseline', help='compare against a saved results file')
+    parser.add_argument('--save-baseline', action='store_true', help=f'save results to {BASELINE_PATH}')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+
+    results = {}
+    print(f"{'size':>8} {'stage':<10} {'ms':>10} {'peak MB':>9} {'vs base':>8}")
+    for size in args.sizes:
+        results[str(size)] = run_size(size, args.repeat, args.seed)
+        for stage, numbers in results[str(size)].items():
+            base = baseline.get(str(size), {}).get(stage)
+            ratio = f"{numbers['seconds'] / base['seconds']:.2f}x" if base and base['seconds'] else ''
+            print(f"{size:>8} {stage:<10} {numbers['seconds'] * 1000:>10.1f} "
+                  f"{numbers['peak_bytes'] / 2**20:>9.1f} {ratio:>8}")
+
+    report = {
+        'created_at': time.time(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+    for path in filter(None, [args.output, BASELINE_PATH if args.save_baseline else None]):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    regressions = compare(results, baseline, args.tolerance)
+    for size, stage, ratio in regressions:
+        print(f"REGRESSION: {stage} at {size} items is {ratio:.2f}x the baseline")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
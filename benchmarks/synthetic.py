@@ -0,0 +1,135 @@
+import json
+import random
+from datetime import datetime, timedelta, timezone
+
+from constants import KNOWN_PLAYERS, LEAGUE_MAPPING, TEAMS_BY_SPORT
+
+STAT_TYPES = {
+    'NBA': ['Points', 'Rebounds', 'Assists', 'Pts+Rebs+Asts', '3-PT Made'],
+    'CBB': ['Points', 'Rebounds', 'Assists'],
+    'NHL': ['Shots On Goal', 'Goalie Saves', 'Points', 'Hits'],
+    'MLB': ['Hits+Runs+RBIs', 'Pitcher Strikeouts', 'Total Bases', 'Hitter Fantasy Score'],
+    'Tennis': ['Total Games', 'Aces', 'Break Points Won'],
+    'Soccer': ['Shots', 'Shots On Target', 'Passes Attempted'],
+    'Golf': ['Strokes', 'Birdies Or Better'],
+    'Esports': ['MAPS 1-2 Kills', 'MAP 1 Kills', 'MAPS 1-2 Headshots'],
+    'NASCAR': ['Fastest Laps', 'Finishing Position'],
+}
+DEFAULT_STAT_TYPES = ['Fantasy Score', 'Total Points']
+
+# Typical line ranges per sport
+LINE_RANGES = {
+    'NBA': (0.5, 50.0), 'CBB': (0.5, 30.0), 'NHL': (0.5, 35.0), 'MLB': (0.5, 12.0),
+    'Tennis': (1.5, 40.0), 'Soccer': (0.5, 60.0), 'Golf': (1.5, 75.0), 'Esports': (5.5, 60.0),
+}
+DEFAULT_LINE_RANGE = (0.5, 40.0)
+
+FIRST_NAMES = ['James', 'Marcus', 'Luis', 'Andre', 'Mikko', 'Jonas', 'Kai', 'Mateo', 'Theo', 'Ilya', 'José', 'Björn']
+LAST_NAMES = ['Walker', 'Nguyen', 'Okafor', 'Lindqvist', 'Pérez', 'Novak', 'Silva', 'Hughes', 'Kowalski', 'Tanaka']
+
+# Share of projections that are team props
+TEAM_PROP_SHARE = 0.15
+
+
+def _league_weights(rng):
+    """Skewed league mix: a few big leagues and a long tail"""
+    leagues = list(LEAGUE_MAPPING)
+    weights = [rng.paretovariate(1.2) for _ in leagues]
+    return leagues, weights
+
+
+def generate_payload(n_items, seed=0, players_per_league=400):
+    """A JSON:API projections payload with n_items projections and its included resources.
+
+    Player props link a new_player and a game; team props link a team-level
+    new_player; quarter props link neither, like older payloads.
+    """
+    rng = random.Random(seed)
+    leagues, weights = _league_weights(rng)
+    start = datetime(2026, 1, 1, 18, tzinfo=timezone.utc)
+
+    player_pool = {}
+    team_entities = {}
+    games = {}
+    included = []
+    for league_id in leagues:
+        sport = LEAGUE_MAPPING[league_id]
+        teams = list(TEAMS_BY_SPORT.get(sport, TEAMS_BY_SPORT['NBA']))
+
+        # Pair the league's teams into games
+        order = teams[:]
+        rng.shuffle(order)
+        for k in range(0, len(order) - 1, 2):
+            game_id = f"{league_id}-g{k // 2}"
+            game = {
+                'start_time': (start + timedelta(minutes=30 * rng.randrange(48))).isoformat(),
+                'home_team': order[k], 'away_team': order[k + 1],
+            }
+            games[league_id, order[k]] = games[league_id, order[k + 1]] = (game_id, game)
+            included.append({'type': 'game', 'id': game_id, 'attributes': game})
+
+        for team in teams:
+            team_id = f"{league_id}-{team}"
+            team_entities[league_id, team] = team_id
+            included.append({
+                'type': 'new_player', 'id': team_id,
+                'attributes': {'name': team, 'team': team, 'position': 'TEAM', 'league': sport},
+            })
+
+        pool = []
+        for i in range(players_per_league):
+            if i < len(KNOWN_PLAYERS) // 4:
+                name = rng.choice(KNOWN_PLAYERS)
+            else:
+                name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i}"
+            player_id = f"{league_id}-{i}"
+            team = rng.choice(teams)
+            pool.append((player_id, name, team))
+            included.append({
+                'type': 'new_player', 'id': player_id,
+                'attributes': {'name': name, 'team': team, 'position': rng.choice(['G', 'F', 'C', 'W', 'D']), 'league': sport},
+            })
+        player_pool[league_id] = pool
+        included.append({'type': 'league', 'id': league_id, 'attributes': {'name': sport}})
+
+    data = []
+    for i in range(n_items):
+        league_id = rng.choices(leagues, weights)[0]
+        sport = LEAGUE_MAPPING[league_id]
+        low, high = LINE_RANGES.get(sport, DEFAULT_LINE_RANGE)
+        player_id, name, team = rng.choice(player_pool[league_id])
+        relationships = {'league': {'data': {'type': 'league', 'id': league_id}}}
+        if rng.random() < TEAM_PROP_SHARE:
+            team = rng.choice(list(TEAMS_BY_SPORT.get(sport, TEAMS_BY_SPORT['NBA'])))
+            if rng.random() < 0.7:
+                name = team
+                player_id = team_entities[league_id, team]
+            else:
+                name = f"{rng.choice('1234')}Q {team}"
+                player_id = None
+        if player_id is not None:
+            relationships['new_player'] = {'data': {'type': 'new_player', 'id': player_id}}
+        attributes = {
+            'line_score': round(rng.uniform(low, high) * 2) / 2,
+            'name': name,
+            'stat_type': rng.choice(STAT_TYPES.get(sport, DEFAULT_STAT_TYPES)),
+            'start_time': (start + timedelta(minutes=30 * rng.randrange(48))).isoformat(),
+            'odds_type': 'standard',
+        }
+        if (league_id, team) in games and player_id is not None:
+            game_id, game = games[league_id, team]
+            relationships['game'] = {'data': {'type': 'game', 'id': game_id}}
+            attributes['start_time'] = game['start_time']
+            attributes['description'] = game['away_team'] if team == game['home_team'] else game['home_team']
+        data.append({
+            'type': 'projection',
+            'id': str(1_000_000 + i),
+            'attributes': attributes,
+            'relationships': relationships,
+        })
+    return {'data': data, 'included': included, 'links': {}, 'meta': {}}
+
+
+def payload_bytes(n_items, seed=0):
+    """Serialized payload, as the API would send it"""
+    return json.dumps(generate_payload(n_items, seed), ensure_ascii=False).encode('utf-8')
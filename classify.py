@@ -0,0 +1,102 @@
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from constants import KNOWN_PLAYERS, TEAMS_BY_SPORT
+
+# Distinct (name, sport) pairs kept in the classification cache
+CLASSIFY_CACHE_SIZE = 8192
+
+# Positions the API gives a player resource that stands for a whole team
+TEAM_POSITIONS = frozenset({'TEAM', 'T'})
+
+QUARTER_PROP_RE = re.compile(r'[0-9][QH]')
+
+# One alternation over every known player, matched case-insensitively
+KNOWN_PLAYER_RE = re.compile(
+    '|'.join(re.escape(player.lower()) for player in sorted(KNOWN_PLAYERS, key=len, reverse=True))
+)
+
+
+@lru_cache(maxsize=CLASSIFY_CACHE_SIZE)
+def get_team_info(name, sport):
+    """Extract team information and format display name"""
+    if not name:
+        return name, None, False
+
+    # Check if it's a quarter/half prop
+    if QUARTER_PROP_RE.search(name):
+        return f"{name} (Quarter Team Prop)", name, True
+
+    # Check if it's a 3-letter team code
+    if len(name) == 3 and name.isupper():
+        team_name = TEAMS_BY_SPORT.get(sport, {}).get(name)
+        if team_name:
+            return f"{name} {team_name}", name, True
+        return f"{name} Team", name, True
+
+    # Check if it's in known players list
+    if KNOWN_PLAYER_RE.search(name.lower()):
+        return name, None, False
+
+    # Check if it has a space (likely a player name)
+    if ' ' in name:
+        return name, None, False
+
+    # Default: treat as team prop
+    return f"{name} (Team)", name, True
+
+
+def classify_names(names, sports):
+    """Classify each distinct (name, sport) pair once and broadcast to rows"""
+    codes, pairs = pd.MultiIndex.from_arrays([names, sports]).factorize()
+    if not len(pairs):
+        return np.array([], dtype=object), np.array([], dtype=object), np.array([], dtype=bool)
+
+    display_name, team_code, is_team = zip(*(get_team_info(name, sport) for name, sport in pairs))
+    return (
+        np.array(display_name, dtype=object)[codes],
+        np.array(team_code, dtype=object)[codes],
+        np.array(is_team, dtype=bool)[codes],
+    )
+
+
+def classify_props(names, sports, teams=None, positions=None):
+    """Display name, team code and team flag, trusting joined player resources.
+
+    Rows whose player resolved to a team get their team and position from
+    the join; only the rest fall back to the name heuristics.
+    """
+    names = np.asarray(names, dtype=object)
+    sports = np.asarray(sports, dtype=object)
+    if teams is None:
+        return classify_names(names, sports)
+
+    teams = np.asarray(teams, dtype=object)
+    team_position = pd.Series(positions, dtype=object).str.upper().isin(TEAM_POSITIONS).to_numpy()
+    resolved = pd.notna(teams)
+    team_entity = resolved & (team_position | (names == teams))
+    player = resolved & ~team_entity
+
+    display_name = names.copy()
+    team_code = np.where(resolved, teams, None)
+    is_team = team_entity.copy()
+
+    guess = ~player
+    if guess.any():
+        guessed_name, guessed_team, guessed_flag = classify_names(names[guess], sports[guess])
+        # A team resource is a team even when its name doesn't look like one
+        fix = team_entity[guess] & ~guessed_flag
+        guessed_name[fix] = [f"{name} (Team)" for name in names[guess][fix]]
+        unresolved = ~resolved[guess]
+        display_name[guess] = guessed_name
+        team_code[guess] = np.where(unresolved, guessed_team, team_code[guess])
+        is_team[guess] = team_entity[guess] | (unresolved & guessed_flag)
+    return display_name, team_code, is_team
+
+
+def classification_cache_info():
+    """Hit/miss counters for the classification cache"""
+    return get_team_info.cache_info()
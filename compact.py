@@ -0,0 +1,105 @@
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Few distinct values repeated on every row: stored as integer codes
+CATEGORY_COLUMNS = ['league_id', 'sport', 'emoji', 'stat_type', 'team_code', 'position', 'opponent', 'game_id']
+
+# Too many distinct values for a category, but repeated across a player's props
+NAME_COLUMNS = ['player_name', 'display_name']
+
+FLOAT_COLUMNS = ['line', 'hit_rate']
+
+# One-byte code per row, same order as the recommendation labels
+RECOMMENDATION_DTYPE = pd.CategoricalDtype(['MORE', 'LESS'])
+
+# Decimals kept when float32 values are widened back for arithmetic
+LINE_DECIMALS = 4
+
+
+def intern_strings(values):
+    """Object array where equal strings share one object"""
+    return np.array([sys.intern(v) if type(v) is str else v for v in values], dtype=object)
+
+
+def compact_board(board):
+    """Board with categorical text columns, interned names and float32 numbers"""
+    columns = {}
+    for name in board.columns:
+        series = board[name]
+        if name in CATEGORY_COLUMNS and not isinstance(series.dtype, pd.CategoricalDtype):
+            columns[name] = series.astype('category')
+        elif name in NAME_COLUMNS and series.dtype == object:
+            columns[name] = pd.Series(intern_strings(series.to_numpy()), index=board.index)
+        elif name in FLOAT_COLUMNS:
+            columns[name] = series.astype(np.float32)
+        elif name == 'is_team':
+            columns[name] = series.astype(bool)
+        elif name == 'recommendation':
+            columns[name] = series.astype(RECOMMENDATION_DTYPE)
+        else:
+            columns[name] = series
+    return pd.DataFrame(columns, index=board.index)
+
+
+def concat_boards(frames):
+    """pd.concat that keeps categorical columns categorical.
+
+    Frames derived separately have different categories, which concat
+    would otherwise fall back to object for; the union is applied first.
+    """
+    frames = [frame for frame in frames if len(frame)]
+    if len(frames) < 2:
+        return frames[0] if frames else pd.DataFrame()
+    for name in frames[0].columns:
+        dtypes = [frame[name].dtype for frame in frames]
+        if all(isinstance(dtype, pd.CategoricalDtype) for dtype in dtypes) and len(set(dtypes)) > 1:
+            categories = pd.api.types.union_categoricals(
+                [pd.Categorical([], dtype=dtype) for dtype in dtypes]
+            ).categories
+            dtype = pd.CategoricalDtype(categories)
+            frames = [frame.assign(**{name: frame[name].astype(dtype)}) for frame in frames]
+    return pd.concat(frames)
+
+
+def widen(values):
+    """float64 copy of float32 values, rounded back to the decimals they were written with"""
+    return np.round(np.asarray(values, dtype=np.float64), LINE_DECIMALS)
+
+
+def _object_bytes(values, seen):
+    """Pointer array plus every distinct object it references, each counted once"""
+    total = values.nbytes
+    for value in values:
+        if id(value) not in seen:
+            seen.add(id(value))
+            total += sys.getsizeof(value)
+    return total
+
+
+def column_bytes(series):
+    """Memory held by a column, counting shared string objects once"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy().nbytes + _object_bytes(series.cat.categories.to_numpy(), set())
+    values = series.to_numpy()
+    if values.dtype == object:
+        return _object_bytes(values, set())
+    return values.nbytes
+
+
+def memory_report(before, after):
+    """Per-column dtype and bytes of two versions of the same board"""
+    report = pd.DataFrame({
+        'dtype_before': before.dtypes.astype(str),
+        'bytes_before': [column_bytes(before[name]) for name in before.columns],
+        'dtype_after': after.dtypes.reindex(before.columns).astype(str),
+        'bytes_after': [column_bytes(after[name]) for name in before.columns],
+    })
+    report.loc['(index)'] = [
+        str(before.index.dtype), column_bytes(before.index.to_series()),
+        str(after.index.dtype), column_bytes(after.index.to_series()),
+    ]
+    report.loc['total'] = ['', report['bytes_before'].sum(), '', report['bytes_after'].sum()]
+    report['ratio'] = report['bytes_after'] / report['bytes_before']
+    return report
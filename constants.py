@@ -0,0 +1,117 @@
+# League mapping
+LEAGUE_MAPPING = {
+    '7': 'NBA', '192': 'NBA',
+    '8': 'NHL', '3': 'NHL',
+    '1': 'MLB', '43': 'MLB', '190': 'MLB',
+    '5': 'Tennis',
+    '6': 'Soccer', '44': 'Soccer', '45': 'Soccer',
+    '82': 'Esports', '265': 'Esports', '80': 'Esports', '84': 'Esports',
+    '121': 'Esports', '145': 'Esports', '159': 'Esports', '161': 'Esports',
+    '174': 'Esports', '176': 'Esports', '383': 'Esports',
+    '131': 'Golf',
+    '20': 'CBB', '290': 'CBB',
+    '4': 'NASCAR', '9': 'NASCAR', '22': 'NASCAR',
+    '12': 'MMA', '42': 'Boxing',
+    '284': 'Handball',
+    '288': 'Unrivaled',
+    '277': 'Curling',
+    '379': 'Olympic Hockey',
+}
+
+# ===================================================
+# TEAM MAPPINGS FOR ALL MAJOR SPORTS
+# ===================================================
+
+NBA_TEAMS = {
+    'ATL': 'Hawks', 'BOS': 'Celtics', 'BKN': 'Nets', 'CHA': 'Hornets', 'CHI': 'Bulls',
+    'CLE': 'Cavaliers', 'DAL': 'Mavericks', 'DEN': 'Nuggets', 'DET': 'Pistons', 'GSW': 'Warriors',
+    'HOU': 'Rockets', 'IND': 'Pacers', 'LAC': 'Clippers', 'LAL': 'Lakers', 'MEM': 'Grizzlies',
+    'MIA': 'Heat', 'MIL': 'Bucks', 'MIN': 'Timberwolves', 'NOP': 'Pelicans', 'NYK': 'Knicks',
+    'OKC': 'Thunder', 'ORL': 'Magic', 'PHI': '76ers', 'PHX': 'Suns', 'POR': 'Trail Blazers',
+    'SAC': 'Kings', 'SAS': 'Spurs', 'TOR': 'Raptors', 'UTA': 'Jazz', 'WAS': 'Wizards'
+}
+
+NHL_TEAMS = {
+    'ANA': 'Ducks', 'ARI': 'Coyotes', 'BOS': 'Bruins', 'BUF': 'Sabres', 'CGY': 'Flames',
+    'CAR': 'Hurricanes', 'CHI': 'Blackhawks', 'COL': 'Avalanche', 'CBJ': 'Blue Jackets',
+    'DAL': 'Stars', 'DET': 'Red Wings', 'EDM': 'Oilers', 'FLA': 'Panthers', 'LAK': 'Kings',
+    'MIN': 'Wild', 'MTL': 'Canadiens', 'NSH': 'Predators', 'NJD': 'Devils', 'NYI': 'Islanders',
+    'NYR': 'Rangers', 'OTT': 'Senators', 'PHI': 'Flyers', 'PIT': 'Penguins', 'SJS': 'Sharks',
+    'SEA': 'Kraken', 'STL': 'Blues', 'TBL': 'Lightning', 'TOR': 'Maple Leafs', 'VAN': 'Canucks',
+    'VGK': 'Golden Knights', 'WSH': 'Capitals', 'WPG': 'Jets'
+}
+
+MLB_TEAMS = {
+    'ARI': 'Diamondbacks', 'ATL': 'Braves', 'BAL': 'Orioles', 'BOS': 'Red Sox',
+    'CHC': 'Cubs', 'CIN': 'Reds', 'CLE': 'Guardians', 'COL': 'Rockies', 'CWS': 'White Sox',
+    'DET': 'Tigers', 'HOU': 'Astros', 'KC': 'Royals', 'LAA': 'Angels', 'LAD': 'Dodgers',
+    'MIA': 'Marlins', 'MIL': 'Brewers', 'MIN': 'Twins', 'NYM': 'Mets', 'NYY': 'Yankees',
+    'OAK': 'Athletics', 'PHI': 'Phillies', 'PIT': 'Pirates', 'SD': 'Padres', 'SF': 'Giants',
+    'SEA': 'Mariners', 'STL': 'Cardinals', 'TB': 'Rays', 'TEX': 'Rangers', 'TOR': 'Blue Jays',
+    'WSH': 'Nationals'
+}
+
+NFL_TEAMS = {
+    'ARI': 'Cardinals', 'ATL': 'Falcons', 'BAL': 'Ravens', 'BUF': 'Bills', 'CAR': 'Panthers',
+    'CHI': 'Bears', 'CIN': 'Bengals', 'CLE': 'Browns', 'DAL': 'Cowboys', 'DEN': 'Broncos',
+    'DET': 'Lions', 'GB': 'Packers', 'HOU': 'Texans', 'IND': 'Colts', 'JAX': 'Jaguars',
+    'KC': 'Chiefs', 'LV': 'Raiders', 'LAC': 'Chargers', 'LAR': 'Rams', 'MIA': 'Dolphins',
+    'MIN': 'Vikings', 'NE': 'Patriots', 'NO': 'Saints', 'NYG': 'Giants', 'NYJ': 'Jets',
+    'PHI': 'Eagles', 'PIT': 'Steelers', 'SF': '49ers', 'SEA': 'Seahawks', 'TB': 'Buccaneers',
+    'TEN': 'Titans', 'WAS': 'Commanders'
+}
+
+# Known player names for detection (from your working list)
+KNOWN_PLAYERS = [
+    # NBA
+    'LeBron James', 'Stephen Curry', 'Kevin Durant', 'Giannis Antetokounmpo', 'Luka Doncic',
+    'Joel Embiid', 'Nikola Jokic', 'Jayson Tatum', 'Shai Gilgeous-Alexander', 'Anthony Davis',
+    'Devin Booker', 'Donovan Mitchell', 'Trae Young', 'Zion Williamson', 'Ja Morant',
+    'Kyrie Irving', 'James Harden', 'Chris Paul', 'Kawhi Leonard', 'Paul George',
+    'Jimmy Butler', 'Bam Adebayo', 'Tyrese Haliburton', 'LaMelo Ball', 'Cade Cunningham',
+    'Victor Wembanyama', 'Chet Holmgren', 'Jalen Williams', 'Scottie Barnes', 'Evan Mobley',
+    'Paolo Banchero', 'Franz Wagner', 'Jalen Green', 'Alperen Sengun', 'Jaren Jackson Jr.',
+    'Desmond Bane', 'Dillon Brooks',
+    
+    # NHL
+    'Connor McDavid', 'Auston Matthews', 'Leon Draisaitl', 'Nathan MacKinnon', 'Nikita Kucherov',
+    'David Pastrnak', 'Sidney Crosby', 'Alex Ovechkin', 'Patrick Kane', 'Jonathan Toews',
+    'Aleksander Barkov', 'Brayden Point', 'Steven Stamkos', 'Victor Hedman', 'Andrei Vasilevskiy',
+    
+    # MLB
+    'Shohei Ohtani', 'Aaron Judge', 'Mike Trout', 'Bryce Harper', 'Mookie Betts',
+    'Freddie Freeman', 'Ronald Acuña Jr.', 'Juan Soto', 'Vladimir Guerrero Jr.', 'Fernando Tatis Jr.',
+    'Manny Machado', 'Max Scherzer', 'Justin Verlander', 'Jacob deGrom', 'Gerrit Cole',
+    'Clayton Kershaw',
+    
+    # Tennis
+    'Novak Djokovic', 'Carlos Alcaraz', 'Jannik Sinner', 'Daniil Medvedev', 'Alexander Zverev',
+    'Andrey Rublev', 'Casper Ruud', 'Stefanos Tsitsipas', 'Holger Rune', 'Taylor Fritz',
+    'Frances Tiafoe', 'Tommy Paul', 'Ben Shelton', 'Sebastian Korda', 'Nick Kyrgios',
+    'Andy Murray', 'Stan Wawrinka',
+    
+    # Golf
+    'Scottie Scheffler', 'Rory McIlroy', 'Jon Rahm', 'Xander Schauffele', 'Patrick Cantlay',
+    'Viktor Hovland', 'Ludvig Aberg', 'Max Homa', 'Tony Finau', 'Collin Morikawa',
+    'Jordan Spieth', 'Justin Thomas', 'Brooks Koepka', 'Bryson DeChambeau', 'Dustin Johnson',
+    'Cameron Smith', 'Hideki Matsuyama', 'Sungjae Im', 'Tom Kim', 'Sam Burns',
+    
+    # Soccer
+    'Lionel Messi', 'Cristiano Ronaldo', 'Erling Haaland', 'Kylian Mbappé', 'Neymar Jr',
+    'Robert Lewandowski', 'Harry Kane', 'Mohamed Salah', 'Kevin De Bruyne', 'Luka Modric',
+    'Karim Benzema', 'Vinícius Jr', 'Jude Bellingham', 'Pedri', 'Gavi', 'Jamal Musiala',
+    'Florian Wirtz', 'Bukayo Saka', 'Phil Foden'
+]
+
+# Team dicts by sport code
+TEAMS_BY_SPORT = {
+    'NBA': NBA_TEAMS, 'NHL': NHL_TEAMS, 'MLB': MLB_TEAMS, 'NFL': NFL_TEAMS,
+}
+
+# Emoji mapping
+SPORT_EMOJI = {
+    'NBA': '🏀', 'NHL': '🏒', 'MLB': '⚾', 'Tennis': '🎾',
+    'Soccer': '⚽', 'Golf': '⛳', 'Esports': '🎮', 'CBB': '🏀',
+    'NASCAR': '🏎️', 'MMA': '🥊', 'Boxing': '🥊', 'Other': '🏆'
+}
+DEFAULT_EMOJI = '🏆'
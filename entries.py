@@ -0,0 +1,304 @@
+"""Persistent store of submitted entries and bulk grading against results.
+
+    python entries.py grade results.csv
+    python entries.py grade results.csv --by sport --since 2026-09-01
+    python entries.py show --last 20
+
+The results file needs projection_id and actual columns; without
+projection_id, legs are matched on player_name, stat_type and line.
+Pushed legs drop out of an entry the way the payout rules do, and
+entries with a leg that has no result yet are left ungraded.
+"""
+import argparse
+import atexit
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from optimizer import MAX_LEGS, MIN_LEGS, PAYOUT_TABLES
+from scoring import pick_probabilities
+
+ENTRY_DB = os.environ.get(
+    'PRIZEPICKS_ENTRY_DB', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'entries.db')
+)
+
+# Entries held in memory before they are written in one transaction
+BATCH_SIZE = 50
+# Seconds a queued entry may wait for its batch
+FLUSH_INTERVAL = 5.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    entry_id INTEGER PRIMARY KEY,
+    created_at REAL NOT NULL,
+    snapshot_version INTEGER,
+    snapshot_fetched_at REAL,
+    mode TEXT NOT NULL,
+    num_legs INTEGER NOT NULL,
+    amount REAL NOT NULL,
+    expected_value REAL
+);
+CREATE TABLE IF NOT EXISTS legs (
+    entry_id INTEGER NOT NULL REFERENCES entries(entry_id),
+    leg INTEGER NOT NULL,
+    projection_id TEXT NOT NULL,
+    league_id TEXT,
+    sport TEXT,
+    player_name TEXT,
+    team_code TEXT,
+    stat_type TEXT,
+    line REAL NOT NULL,
+    pick TEXT NOT NULL,
+    hit_rate REAL,
+    PRIMARY KEY (entry_id, leg)
+);
+CREATE INDEX IF NOT EXISTS entries_created ON entries(created_at);
+"""
+
+LEG_COLUMNS = ['projection_id', 'league_id', 'sport', 'player_name', 'team_code', 'stat_type', 'line', 'pick', 'hit_rate']
+
+# Results columns used to match legs when the file has no projection_id
+FALLBACK_KEYS = ['player_name', 'stat_type', 'line']
+
+
+class EntryStore:
+    """SQLite-backed entry history in WAL mode with batched inserts.
+
+    add() only queues an entry; queued entries are written together once
+    BATCH_SIZE of them are waiting, FLUSH_INTERVAL after the first was
+    queued, when something reads the store, or when the process exits.
+    """
+
+    def __init__(self, path=ENTRY_DB, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending = []
+        self._oldest = None
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(SCHEMA)
+        atexit.register(self.flush)
+
+    def add(self, legs, mode, amount, snapshot_version=None, snapshot_fetched_at=None, expected_value=None,
+            created_at=None):
+        """Queue one entry; legs are dicts with the LEG_COLUMNS keys"""
+        created_at = time.time() if created_at is None else created_at
+        entry = (created_at, snapshot_version, snapshot_fetched_at, mode, len(legs), float(amount), expected_value,
+                 [tuple(leg.get(name) for name in LEG_COLUMNS) for leg in legs])
+        with self._lock:
+            self._pending.append(entry)
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+                # Writes the batch if nothing else does first
+                timer = threading.Timer(self.flush_interval, self.flush)
+                timer.daemon = True
+                timer.start()
+            due = len(self._pending) >= self.batch_size
+        if due:
+            self.flush()
+
+    def pending(self):
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self):
+        """Write every queued entry in one transaction"""
+        with self._lock:
+            pending, self._pending, self._oldest = self._pending, [], None
+            if not pending:
+                return 0
+            with self._conn:
+                for *entry, legs in pending:
+                    cursor = self._conn.execute(
+                        'INSERT INTO entries (created_at, snapshot_version, snapshot_fetched_at, mode, num_legs, '
+                        'amount, expected_value) VALUES (?, ?, ?, ?, ?, ?, ?)', entry,
+                    )
+                    entry_id = cursor.lastrowid
+                    self._conn.executemany(
+                        f'INSERT INTO legs (entry_id, leg, {", ".join(LEG_COLUMNS)}) '
+                        f'VALUES ({", ".join("?" * (len(LEG_COLUMNS) + 2))})',
+                        [(entry_id, i, *leg) for i, leg in enumerate(legs)],
+                    )
+        return len(pending)
+
+    def load(self, since=None):
+        """(entries, legs) frames, optionally only entries created at or after since"""
+        self.flush()
+        where, params = ('WHERE created_at >= ?', (since,)) if since is not None else ('', ())
+        with self._lock:
+            entries = pd.read_sql_query(f'SELECT * FROM entries {where} ORDER BY entry_id', self._conn, params=params)
+            legs = pd.read_sql_query(
+                f'SELECT legs.* FROM legs JOIN entries USING (entry_id) {where} ORDER BY entry_id, leg',
+                self._conn, params=params,
+            )
+        return entries, legs
+
+    def count(self):
+        self.flush()
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+    def close(self):
+        self.flush()
+        atexit.unregister(self.flush)
+        self._conn.close()
+
+
+def payout_table():
+    """Multipliers as a dense [mode, legs, hits] array, with the modes' order"""
+    modes = list(PAYOUT_TABLES)
+    table = np.full((len(modes), MAX_LEGS + 1, MAX_LEGS + 1), np.nan)
+    for m, mode in enumerate(modes):
+        for num_legs, payouts in PAYOUT_TABLES[mode].items():
+            table[m, num_legs, :num_legs + 1] = 0.0
+            for hits, multiplier in payouts.items():
+                table[m, num_legs, hits] = multiplier
+    return table, modes
+
+
+def leg_outcomes(legs, results):
+    """Actual value, hit and push per leg; actual is NaN where no result matched"""
+    if 'projection_id' in results:
+        ids = results['projection_id'].astype(str)
+        actual = results['actual'].set_axis(ids)
+        actual = actual[~ids.duplicated(keep='last').to_numpy()]
+        actual = actual.reindex(legs['projection_id'].to_numpy()).to_numpy(dtype=np.float64)
+    else:
+        keys = results.drop_duplicates(FALLBACK_KEYS, keep='last').set_index(FALLBACK_KEYS)['actual']
+        actual = keys.reindex(pd.MultiIndex.from_frame(legs[FALLBACK_KEYS])).to_numpy(dtype=np.float64)
+    line = legs['line'].to_numpy(dtype=np.float64)
+    more = legs['pick'].to_numpy() == 'MORE'
+    push = actual == line
+    hit = np.where(more, actual > line, actual < line) & ~push
+    return actual, hit, push
+
+
+def grade(entries, legs, results):
+    """Grade every entry in one pass.
+
+    Returns (entries, legs) with hit/push per leg and, per entry, the
+    legs hit, the legs left after pushes, the payout multiplier and the
+    profit. An entry pushed below MIN_LEGS, or to a size its mode has no
+    payout for, is refunded.
+    """
+    actual, hit, push = leg_outcomes(legs, results)
+    legs = legs.assign(
+        actual=actual, hit=hit, push=push, graded=~np.isnan(actual),
+        # hit_rate is stored as P(MORE); this is the chance of the side actually picked
+        pick_probability=pick_probabilities(legs['hit_rate'].to_numpy(), legs['pick'].to_numpy()),
+    )
+
+    # Legs are stored entry by entry, so per-entry sums are bincounts over entry positions
+    position = pd.Index(entries['entry_id']).get_indexer(legs['entry_id'])
+    n = len(entries)
+    hits = np.bincount(position, weights=hit, minlength=n).astype(np.int64)
+    pushes = np.bincount(position, weights=push, minlength=n).astype(np.int64)
+    ungraded = np.bincount(position, weights=~legs['graded'].to_numpy(), minlength=n) > 0
+
+    table, modes = payout_table()
+    mode = pd.Index(modes).get_indexer(entries['mode'])
+    live = np.clip(entries['num_legs'].to_numpy() - pushes, 0, MAX_LEGS)
+    multiplier = table[np.maximum(mode, 0), live, np.minimum(hits, live)]
+    refund = (mode < 0) | (live < MIN_LEGS) | np.isnan(multiplier)
+    multiplier = np.where(refund, 1.0, multiplier)
+
+    amount = entries['amount'].to_numpy(dtype=np.float64)
+    graded = ~ungraded
+    entries = entries.assign(
+        hits=hits,
+        pushes=pushes,
+        live_legs=live,
+        graded=graded,
+        multiplier=np.where(graded, multiplier, np.nan),
+        payout=np.where(graded, amount * multiplier, np.nan),
+        profit=np.where(graded, amount * (multiplier - 1), np.nan),
+    )
+    # Each leg carries an equal share of its entry's stake and return
+    share = 1 / entries['num_legs'].to_numpy(dtype=np.float64)[position]
+    legs = legs.assign(
+        stake=amount[position] * share,
+        returned=entries['payout'].to_numpy()[position] * share,
+        entry_graded=graded[position],
+    )
+    return entries, legs
+
+
+def roi_report(legs, by=('sport', 'stat_type')):
+    """Leg hit rates and stake-weighted ROI of graded entries per group"""
+    legs = legs[legs['entry_graded']]
+    grouped = legs.groupby(list(by), observed=True, dropna=False)
+    decided = legs[~legs['push']].groupby(list(by), observed=True, dropna=False)
+    report = pd.DataFrame({
+        'legs': grouped.size(),
+        'pushes': grouped['push'].sum(),
+        'hits': decided['hit'].sum(),
+        'predicted': decided['pick_probability'].mean(),
+        'staked': grouped['stake'].sum(),
+        'returned': grouped['returned'].sum(),
+    })
+    report['hits'] = report['hits'].fillna(0).astype(np.int64)
+    report['hit_rate'] = report['hits'] / (report['legs'] - report['pushes']).where(lambda x: x > 0)
+    report['roi'] = (report['returned'] - report['staked']) / report['staked']
+    return report.sort_values('staked', ascending=False)
+
+
+def read_results(path):
+    """Load a results file with projection ids as strings"""
+    return pd.read_csv(path, dtype={'projection_id': str, 'player_name': str, 'stat_type': str})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--db', default=ENTRY_DB)
+    commands = parser.add_subparsers(dest='command', required=True)
+    grade_cmd = commands.add_parser('grade', help='grade stored entries against a results CSV')
+    grade_cmd.add_argument('results')
+    grade_cmd.add_argument('--by', nargs='*', default=['sport', 'stat_type'], help='leg columns to group ROI by')
+    grade_cmd.add_argument('--since', help='only entries created on or after this date')
+    grade_cmd.add_argument('-o', '--output', help='write graded entries to this CSV')
+    show_cmd = commands.add_parser('show', help='print the most recent entries')
+    show_cmd.add_argument('--last', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    store = EntryStore(args.db)
+    if args.command == 'show':
+        entries, legs = store.load()
+        for entry in entries.tail(args.last).itertuples():
+            picks = legs[legs['entry_id'] == entry.entry_id]
+            print(f"#{entry.entry_id} {time.strftime('%Y-%m-%d %H:%M', time.localtime(entry.created_at))} "
+                  f"{entry.mode} ${entry.amount:.2f} (snapshot v{entry.snapshot_version}): "
+                  + ", ".join(f"{leg.player_name} {leg.stat_type} {leg.pick} {leg.line:g}" for leg in picks.itertuples()))
+        return 0
+
+    started = time.perf_counter()
+    since = pd.Timestamp(args.since).timestamp() if args.since else None
+    entries, legs = store.load(since)
+    entries, legs = grade(entries, legs, read_results(args.results))
+    graded = entries[entries['graded']]
+    staked, returned = graded['amount'].sum(), graded['payout'].sum()
+    print(f"Graded {len(graded):,} of {len(entries):,} entries ({len(legs):,} legs) "
+          f"in {time.perf_counter() - started:.2f}s", file=sys.stderr)
+    if staked:
+        print(f"Staked ${staked:,.2f}, returned ${returned:,.2f}, ROI {(returned - staked) / staked * 100:+.1f}%")
+        for mode, group in graded.groupby('mode'):
+            print(f"  {mode}: {len(group):,} entries, ROI {group['profit'].sum() / group['amount'].sum() * 100:+.1f}%")
+        report = roi_report(legs, args.by)
+        print(report.to_string(formatters={
+            'predicted': '{:.3f}'.format, 'hit_rate': '{:.3f}'.format, 'roi': '{:+.1%}'.format,
+            'staked': '{:,.2f}'.format, 'returned': '{:,.2f}'.format,
+        }))
+    if args.output:
+        entries.to_csv(args.output, index=False)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,309 @@
+"""Read-only HTTP feed of the scored board for dashboards and scripts.
+
+    python feed.py --port 8600
+    curl --compressed 'http://127.0.0.1:8600/board.csv?league=7&min_hit_rate=0.55'
+
+The Streamlit app serves the same feed from its own fetcher when
+PRIZEPICKS_FEED_PORT is set, so every consumer shares one upstream
+fetch. Endpoints:
+
+    /board, /board.json, /board.csv   filtered board, best hit rate first
+    /health                            snapshot version, rows and age
+
+Query parameters (repeat or comma-separate for several values): league,
+team, player, min_hit_rate (0-1, or a percentage), teams=0 to drop team
+props, recommended=1 and limit. Responses carry an ETag and are gzipped
+when the client accepts it.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import math
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+from compact import widen
+from filters import FilterIndex
+from pipeline import BOARD_COLUMNS, RESOLVED_COLUMNS
+
+FEED_HOST = os.environ.get('PRIZEPICKS_FEED_HOST', '127.0.0.1')
+# Unset or 0 keeps the app from starting the feed
+FEED_PORT = int(os.environ.get('PRIZEPICKS_FEED_PORT') or 0)
+DEFAULT_FEED_PORT = 8600
+
+# Encoded responses kept per snapshot version
+RESPONSE_CACHE_SIZE = 256
+GZIP_LEVEL = 6
+
+CONTENT_TYPES = {'json': 'application/json', 'csv': 'text/csv; charset=utf-8'}
+
+_EMPTY = np.array([], dtype=np.intp)
+
+
+def _group_ranks(keys):
+    """Sorted ranks per key for keys laid out in rank order"""
+    codes, uniques = pd.factorize(keys)
+    grouping = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[grouping], np.arange(len(uniques) + 1))
+    return {key: grouping[bounds[code]:bounds[code + 1]] for code, key in enumerate(uniques)}
+
+
+class FeedIndex:
+    """Lookups behind the feed's query parameters, built once per snapshot.
+
+    Extends the board's FilterIndex with rank arrays per team code and
+    per player, and hit rates in rank order so a minimum hit rate is a
+    prefix of the ranks.
+    """
+
+    def __init__(self, version, board):
+        self.version = version
+        self.board = board
+        self.filters = FilterIndex(board)
+        order = self.filters.order
+        self.hit_rates = widen(board['hit_rate'])[order]
+        team_codes = board['team_code'].astype(object).to_numpy()[order]
+        self.team_ranks = _group_ranks(np.array([
+            '' if pd.isna(code) else str(code).casefold() for code in team_codes
+        ], dtype=object))
+        player_ranks = _group_ranks(board['player_name'].str.casefold().to_numpy(dtype=object)[order])
+        for name, ranks in _group_ranks(board['display_name'].str.casefold().to_numpy(dtype=object)[order]).items():
+            player_ranks[name] = np.union1d(player_ranks[name], ranks) if name in player_ranks else ranks
+        self.player_ranks = player_ranks
+        self.columns = ['projection_id'] + [name for name in BOARD_COLUMNS + RESOLVED_COLUMNS if name in board]
+        self._responses = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _lookup(self, table, keys):
+        parts = [table[key.casefold()] for key in keys if key.casefold() in table]
+        return np.unique(np.concatenate(parts)) if parts else _EMPTY
+
+    def ranks(self, query):
+        """Sorted ranks of the rows matching a normalized query"""
+        ranks = self.filters.ranks(query['league'] or None, query['teams'], query['recommended'])
+        if query['team']:
+            ranks = np.intersect1d(ranks, self._lookup(self.team_ranks, query['team']), assume_unique=True)
+        if query['player']:
+            ranks = np.intersect1d(ranks, self._lookup(self.player_ranks, query['player']), assume_unique=True)
+        if query['min_hit_rate'] is not None:
+            # Hit rates fall with rank, so the rows above the bar are a prefix
+            cutoff = np.searchsorted(-self.hit_rates, -query['min_hit_rate'], side='right')
+            ranks = ranks[:np.searchsorted(ranks, cutoff)]
+        if query['limit'] is not None:
+            ranks = ranks[:query['limit']]
+        return ranks
+
+    def encode(self, query, fmt):
+        """Response body for a query in json or csv"""
+        rows = self.board.take(self.filters.order[self.ranks(query)])
+        frame = rows.rename_axis('projection_id').reset_index()[self.columns]
+        if fmt == 'csv':
+            return frame.to_csv(index=False, float_format='%.4f').encode('utf-8')
+        return frame.to_json(orient='records', date_format='iso', double_precision=4).encode('utf-8')
+
+    def response(self, query, fmt, compressed):
+        """(etag, body) for a query, encoded once per board version"""
+        key = (json.dumps(query, sort_keys=True), fmt, compressed)
+        with self._lock:
+            if key in self._responses:
+                self._responses.move_to_end(key)
+                return self._responses[key]
+        body = self.encode(query, fmt)
+        # A content hash, so a tag never outlives the bytes it names, across restarts included;
+        # compressed and plain bodies differ, so their tags do too
+        etag = f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}{"-gz" if compressed else ""}"'
+        if compressed:
+            body = gzip.compress(body, GZIP_LEVEL, mtime=0)
+        with self._lock:
+            self._responses[key] = etag, body
+            if len(self._responses) > RESPONSE_CACHE_SIZE:
+                self._responses.popitem(last=False)
+        return etag, body
+
+
+def _values(params, name):
+    values = []
+    for value in params.get(name, []):
+        values.extend(part.strip() for part in value.split(',') if part.strip())
+    return sorted(set(values))
+
+
+def _flag(params, name, default):
+    values = params.get(name)
+    if not values:
+        return default
+    return values[-1].strip().lower() not in ('0', 'false', 'no', 'off', '')
+
+
+def parse_query(query_string):
+    """Normalized query dict; raises ValueError on a malformed number"""
+    params = parse_qs(query_string)
+    min_hit_rate = params.get('min_hit_rate', [None])[-1]
+    if min_hit_rate is not None:
+        min_hit_rate = float(min_hit_rate)
+        if not math.isfinite(min_hit_rate):
+            raise ValueError('min_hit_rate must be a finite number')
+        if min_hit_rate > 1:
+            min_hit_rate /= 100
+    limit = params.get('limit', [None])[-1]
+    if limit is not None:
+        limit = int(limit)
+        if limit < 0:
+            raise ValueError('limit must not be negative')
+    return {
+        'league': _values(params, 'league'),
+        'team': _values(params, 'team'),
+        'player': _values(params, 'player'),
+        'min_hit_rate': min_hit_rate,
+        'teams': _flag(params, 'teams', True),
+        'recommended': _flag(params, 'recommended', False),
+        'limit': limit,
+    }
+
+
+class BoardFeed:
+    """Serves the board of a fetcher and snapshot store over HTTP.
+
+    Requests never touch the network: the current snapshot is applied to
+    the shared store (a no-op unless the fetcher published a new one) and
+    the FeedIndex is rebuilt only when the board version changes.
+    """
+
+    def __init__(self, fetcher, store):
+        self.fetcher = fetcher
+        self.store = store
+        self.server = None
+        self.error = None
+        self._index = None
+        self._lock = threading.Lock()
+
+    def current(self):
+        """FeedIndex of the latest snapshot, or None before the first one"""
+        snapshot = self.fetcher.latest()
+        if snapshot is None:
+            return None
+        board, changes = self.store.update(snapshot.frame, source_key=snapshot.fetched_at)
+        with self._lock:
+            if self._index is None or self._index.version != changes.version:
+                self._index = FeedIndex(changes.version, board)
+            return self._index
+
+    def health(self):
+        snapshot = self.fetcher.latest()
+        index = self.current()
+        return {
+            'version': index.version if index else 0,
+            'rows': len(index.board) if index else 0,
+            'age_seconds': round(snapshot.age, 1) if snapshot else None,
+            'source': snapshot.source if snapshot else None,
+            'stale_leagues': list(snapshot.stale_leagues) if snapshot else [],
+            'last_error': self.fetcher.last_error,
+        }
+
+    def start(self, port=DEFAULT_FEED_PORT, host=FEED_HOST):
+        """Listen on a daemon thread; raises OSError if the port is taken"""
+        if self.server is None:
+            self.server = ThreadingHTTPServer((host, port), make_handler(self))
+            self.server.daemon_threads = True
+            threading.Thread(target=self.server.serve_forever, name='board-feed', daemon=True).start()
+        return self
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+def make_handler(feed):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        # Headers and body go out in separate writes; don't let Nagle hold the body back
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == '/health':
+                self._send(200, json.dumps(feed.health()).encode('utf-8'), 'application/json')
+                return
+            fmt = {'/board': 'json', '/board.json': 'json', '/board.csv': 'csv'}.get(url.path)
+            if fmt is None:
+                self._send(404, b'{"error": "not found"}', 'application/json')
+                return
+            try:
+                query = parse_query(url.query)
+            except ValueError as exc:
+                self._send(400, json.dumps({'error': str(exc)}).encode('utf-8'), 'application/json')
+                return
+            index = feed.current()
+            if index is None:
+                self._send(503, b'{"error": "no snapshot yet"}', 'application/json', {'Retry-After': '5'})
+                return
+
+            compressed = 'gzip' in self.headers.get('Accept-Encoding', '')
+            etag, body = index.response(query, fmt, compressed)
+            headers = {'ETag': etag, 'Cache-Control': 'no-cache', 'Vary': 'Accept-Encoding',
+                       'X-Board-Version': str(index.version)}
+            if etag in self.headers.get('If-None-Match', ''):
+                self._send(304, b'', None, headers)
+                return
+            if compressed:
+                headers['Content-Encoding'] = 'gzip'
+            self._send(200, body, CONTENT_TYPES[fmt], headers)
+
+        def _send(self, status, body, content_type, headers=None):
+            self.send_response(status)
+            if content_type:
+                self.send_header('Content-Type', content_type)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def main(argv=None):
+    from archive import ARCHIVE_DIR, SnapshotArchive
+    from fetcher import FETCH_MODE, BackgroundFetcher, LeagueFetcher
+    from pipeline import derive_board
+    from snapshot import SnapshotStore
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default=FEED_HOST)
+    parser.add_argument('--port', type=int, default=FEED_PORT or DEFAULT_FEED_PORT)
+    parser.add_argument('--archive-dir', help='archive to seed from and append to')
+    args = parser.parse_args(argv)
+
+    fetcher_class = LeagueFetcher if FETCH_MODE == 'leagues' else BackgroundFetcher
+    fetcher = fetcher_class(archive=SnapshotArchive(args.archive_dir or ARCHIVE_DIR))
+    fetcher.seed_from_archive()
+    fetcher.start()
+    feed = BoardFeed(fetcher, SnapshotStore(derive_board)).start(args.port, args.host)
+    print(f"Serving the board at http://{args.host}:{feed.server.server_port}/board", file=sys.stderr)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        feed.stop()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
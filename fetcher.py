@@ -0,0 +1,454 @@
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from functools import partial
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+from constants import LEAGUE_MAPPING
+from ingest import ingest_stream
+from scheduler import RefreshScheduler, line_churn
+
+PROJECTIONS_URL = os.environ.get('PRIZEPICKS_PROJECTIONS_URL', "https://api.prizepicks.com/projections")
+
+# 'leagues' fetches each league on its own schedule, 'board' pulls everything every REFRESH_INTERVAL
+FETCH_MODE = os.environ.get('PRIZEPICKS_FETCH_MODE', 'leagues')
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (iPad; CPU OS 16_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.6 Mobile/15E148 Safari/604.1',
+    'Accept': 'application/json',
+    'Referer': 'https://app.prizepicks.com/',
+}
+
+# Seconds between successful refreshes
+REFRESH_INTERVAL = 300
+REQUEST_TIMEOUT = 15
+
+# Exponential backoff with jitter after failed refreshes
+BACKOFF_BASE = 2.0
+BACKOFF_CAP = 300.0
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+# Per-league fetching: parallel requests, a time limit covering all of a
+# league's pages, and the page size asked for
+LEAGUE_WORKERS = 8
+LEAGUE_TIMEOUT = 20
+PER_PAGE = 250
+MAX_PAGES = 40
+
+# Seconds a league counts as viewed after a session last showed it
+WATCH_TTL = 900
+
+# Seconds between whole-board passes that find leagues missing from
+# LEAGUE_MAPPING and refresh props without a league
+DISCOVERY_INTERVAL = 1800
+
+# league_id given to projections without a league relationship
+NO_LEAGUE = 'unknown'
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """Last good projections frame published by the fetcher"""
+    frame: object
+    fetched_at: float
+    checked_at: float
+    etag: str = None
+    last_modified: str = None
+    # 'live' or 'archive'
+    source: str = 'live'
+    # Leagues whose rows are left over from an earlier refresh that worked
+    stale_leagues: tuple = ()
+
+    @property
+    def age(self):
+        """Seconds since the data was downloaded"""
+        return time.time() - self.fetched_at
+
+
+def make_session(pool_size=4):
+    """HTTP session with a pooled, keep-alive connection adapter"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    return session
+
+
+def backoff_delay(failures, retry_after=None):
+    """Seconds to wait after the given number of consecutive failures"""
+    if retry_after is not None:
+        return min(retry_after, BACKOFF_CAP)
+    ceiling = min(BACKOFF_CAP, BACKOFF_BASE * 2 ** failures)
+    return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+
+def _retry_after_seconds(response):
+    value = response.headers.get('Retry-After')
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class BackgroundFetcher:
+    """Refreshes the projections board on a daemon thread.
+
+    Readers call latest() and never touch the network; a failed refresh
+    leaves the previous snapshot in place and records last_error.
+    """
+
+    def __init__(self, url=PROJECTIONS_URL, interval=REFRESH_INTERVAL, session=None, timeout=REQUEST_TIMEOUT,
+                 archive=None):
+        self.url = url
+        self.interval = interval
+        self.timeout = timeout
+        self.session = session or make_session()
+        self.archive = archive
+        self.archive_error = None
+        self.failures = 0
+        self.last_error = None
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._ready = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='projections-fetcher', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
+
+    def latest(self):
+        """Most recent good snapshot, or None before the first success"""
+        with self._lock:
+            return self._snapshot
+
+    def publish(self, snapshot):
+        """Make a snapshot visible to readers"""
+        with self._lock:
+            self._snapshot = snapshot
+        self._ready.set()
+
+    def seed_from_archive(self):
+        """Publish the newest archived snapshot so a cold boot can render at once"""
+        if self.archive is None or self.latest() is not None:
+            return False
+        try:
+            archived = self.archive.latest()
+        except (OSError, ValueError) as exc:
+            self.archive_error = str(exc)
+            return False
+        if archived is None:
+            return False
+        fetched_at, frame = archived
+        self.publish(Snapshot(frame, fetched_at, fetched_at, source='archive'))
+        return True
+
+    def wait_ready(self, timeout=None):
+        """Block until the first snapshot is available; for cold boots only"""
+        return self._ready.wait(timeout)
+
+    def refresh_now(self):
+        """Ask the background thread to refresh without waiting for the interval"""
+        self._wake.set()
+
+    def watch(self, leagues):
+        """Leagues a session is showing; the whole board is fetched regardless"""
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                delay = self.refresh_once()
+            except Exception as exc:
+                # An unexpected error must not end the thread and freeze the board
+                delay = self._failed(f"{type(exc).__name__}: {exc}")
+            self._wake.wait(delay)
+            self._wake.clear()
+
+    def refresh_once(self):
+        """Run one conditional GET and return the delay before the next one"""
+        previous = self.latest()
+        headers = {}
+        if previous is not None:
+            if previous.etag:
+                headers['If-None-Match'] = previous.etag
+            if previous.last_modified:
+                headers['If-Modified-Since'] = previous.last_modified
+
+        try:
+            with self.session.get(self.url, headers=headers, timeout=self.timeout, stream=True) as response:
+                if response.status_code == 304 and previous is not None:
+                    self.publish(Snapshot(
+                        previous.frame, previous.fetched_at, time.time(),
+                        previous.etag, previous.last_modified,
+                    ))
+                    return self._succeeded()
+
+                if response.status_code in RETRYABLE_STATUS:
+                    return self._failed(f"HTTP {response.status_code}", _retry_after_seconds(response))
+
+                response.raise_for_status()
+                frame = ingest_stream(response.iter_content(chunk_size=65536))
+                now = time.time()
+                self.publish(Snapshot(
+                    frame, now, now,
+                    response.headers.get('ETag'), response.headers.get('Last-Modified'),
+                ))
+        except (requests.RequestException, ValueError) as exc:
+            return self._failed(str(exc) or type(exc).__name__)
+
+        self._archive(frame, now)
+        return self._succeeded()
+
+    def _archive(self, frame, fetched_at):
+        """Append a fresh download to the local archive, if one is attached"""
+        if self.archive is None:
+            return
+        try:
+            self.archive.append(frame, fetched_at)
+            self.archive.prune()
+            self.archive_error = None
+        except OSError as exc:
+            self.archive_error = str(exc)
+
+    def _succeeded(self):
+        self.failures = 0
+        self.last_error = None
+        return self.interval
+
+    def _failed(self, error, retry_after=None):
+        self.failures += 1
+        self.last_error = error
+        return backoff_delay(self.failures, retry_after)
+
+
+def fetch_league(session, url, league_id, per_page=PER_PAGE, timeout=LEAGUE_TIMEOUT):
+    """Every page of one league's projections as (raw frame, pages requested).
+
+    Follows links.next when the API sends it and otherwise asks for the
+    next page number until a page comes back with fewer than per_page
+    items. A page of ids already seen, as from a server that ignores
+    page, ends the loop. timeout bounds all pages together.
+    """
+    deadline = time.monotonic() + timeout
+    params = {'league_id': league_id, 'per_page': per_page, 'page': 1}
+    frames = []
+    seen = set()
+    requested = 0
+    for _ in range(MAX_PAGES):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError(f"timed out after {requested} pages")
+        members, item_ids = {}, []
+        with session.get(url, params=params, timeout=remaining, stream=True) as response:
+            response.raise_for_status()
+            frame = ingest_stream(response.iter_content(chunk_size=65536), members, item_ids)
+        requested += 1
+        if item_ids and seen.issuperset(item_ids):
+            break
+        seen.update(item_ids)
+        frames.append(frame)
+
+        next_url = (members.get('links') or {}).get('next')
+        if next_url:
+            url, params = next_url, None
+        # Counted before ingest drops items without a line or a player
+        elif params is not None and len(item_ids) >= per_page:
+            params = dict(params, page=params['page'] + 1)
+        else:
+            break
+
+    frame = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+    frame = frame.drop_duplicates('projection_id', keep='last')
+    # Servers that ignore the filter send the whole board
+    return frame[frame['league_id'] == league_id].reset_index(drop=True), requested
+
+
+class LeagueFetcher(BackgroundFetcher):
+    """Fetches leagues in parallel, each on its own schedule, into one snapshot.
+
+    A RefreshScheduler decides which leagues are due from their game
+    start times, line churn and whether a session showed them within
+    WATCH_TTL, under an hourly request budget. Leagues that are not due
+    keep their rows; a league whose fetch fails keeps the rows of its
+    last good fetch and is listed in the snapshot's stale_leagues.
+
+    Unless leagues is given, a whole-board pass every DISCOVERY_INTERVAL
+    adds leagues outside LEAGUE_MAPPING to the schedule and carries the
+    props that have no league at all.
+    """
+
+    def __init__(self, url=PROJECTIONS_URL, leagues=None, workers=LEAGUE_WORKERS, league_timeout=LEAGUE_TIMEOUT,
+                 per_page=PER_PAGE, session=None, scheduler=None, discovery_interval=DISCOVERY_INTERVAL, **kwargs):
+        super().__init__(url, session=session or make_session(pool_size=workers), **kwargs)
+        self.leagues = list(leagues or LEAGUE_MAPPING)
+        self.discovery_interval = None if leagues else discovery_interval
+        self.discovered_at = None
+        self.league_timeout = league_timeout
+        self.per_page = per_page
+        self.scheduler = scheduler or RefreshScheduler()
+        self.league_errors = {}
+        # league_id -> (fetched_at, raw frame) of its last good fetch
+        self._frames = {}
+        self._watched = {}
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='league-fetch')
+
+    def watch(self, leagues):
+        """Mark these leagues as viewed; an empty selection means every league"""
+        now = time.monotonic()
+        leagues = list(leagues) or self.leagues
+        with self._lock:
+            newly = [league_id for league_id in leagues if now - self._watched.get(league_id, -WATCH_TTL) >= WATCH_TTL]
+            for league_id in leagues:
+                self._watched[league_id] = now
+            missing = [league_id for league_id in leagues if league_id not in self._frames]
+        # Leagues that failed keep their backoff; only ones never tried are pulled forward
+        missing = self.scheduler.untried(missing)
+        if missing:
+            self.scheduler.expire(missing)
+        # A league that just gained a viewer may now be due sooner
+        if (missing or newly) and self._thread is not None:
+            self._wake.set()
+
+    def watched(self, now=None):
+        """Leagues a session has shown within WATCH_TTL"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            return [league_id for league_id in self.leagues if now - self._watched.get(league_id, -WATCH_TTL) < WATCH_TTL]
+
+    def wanted(self):
+        """Leagues the next refresh will request"""
+        return self.scheduler.due(self.leagues, self.watched())
+
+    def refresh_now(self):
+        """Refetch the viewed leagues (every league if none are) on the next pass"""
+        self.scheduler.expire(self.watched() or self.leagues)
+        super().refresh_now()
+
+    def schedule(self):
+        """Per-league refresh plan, for display"""
+        return self.scheduler.status(self.leagues, self.watched())
+
+    def league_ages(self, now=None):
+        """Seconds since each held league was last fetched"""
+        now = time.time() if now is None else now
+        with self._lock:
+            return {league_id: now - fetched_at for league_id, (fetched_at, _) in self._frames.items()}
+
+    def _seed_frames(self):
+        """Split an archived board into leagues so failures can fall back on it"""
+        previous = self.latest()
+        if previous is None:
+            return
+        with self._lock:
+            if self._frames:
+                return
+            for league_id, frame in previous.frame.groupby('league_id', sort=False):
+                self._frames[league_id] = (previous.fetched_at, frame.reset_index(drop=True))
+
+    def refresh_once(self):
+        """Fetch the leagues that are due and publish the merged board.
+
+        Returns the seconds until the next league falls due.
+        """
+        self._seed_frames()
+        discovered = self._discover()
+        wanted = self.wanted()
+        if not wanted and not discovered:
+            return self._next_wakeup()
+        try:
+            futures = {
+                self._executor.submit(fetch_league, self.session, self.url, league_id, self.per_page, self.league_timeout): league_id
+                for league_id in wanted
+            }
+        except RuntimeError:
+            # The pool is gone because the interpreter is shutting down
+            self.stop()
+            return 0
+        fetched, errors = {}, {}
+        for future in as_completed(futures):
+            league_id = futures[future]
+            try:
+                fetched[league_id] = future.result()
+            except (requests.RequestException, ValueError, TimeoutError) as exc:
+                errors[league_id] = str(exc) or type(exc).__name__
+                response = getattr(exc, 'response', None)
+                retry_after = _retry_after_seconds(response) if response is not None else None
+                self.scheduler.failed(league_id, partial(backoff_delay, retry_after=retry_after))
+
+        if not fetched and not discovered:
+            self.league_errors = errors
+            self._failed(f"all {len(wanted)} leagues failed")
+            return self._next_wakeup()
+
+        now = time.time()
+        with self._lock:
+            previous = {league_id: self._frames.get(league_id, (None, None))[1] for league_id in fetched}
+        changed = discovered or any(
+            previous[league_id] is None or not previous[league_id].equals(frame) for league_id, (frame, _) in fetched.items()
+        )
+        for league_id, (frame, pages) in fetched.items():
+            self.scheduler.fetched(league_id, frame, pages, line_churn(previous[league_id], frame), now)
+        with self._lock:
+            for league_id, (frame, _) in fetched.items():
+                self._frames[league_id] = (now, frame)
+            frames = [frame for _, frame in self._frames.values()]
+            stale = tuple(sorted(league_id for league_id in errors if league_id in self._frames))
+        merged = pd.concat(frames, ignore_index=True)
+
+        self.league_errors = errors
+        self._succeeded()
+        if errors:
+            self.last_error = f"{len(errors)} of {len(wanted)} leagues failed"
+        self.publish(Snapshot(merged, now, now, stale_leagues=stale))
+        # The archive holds whole boards, so a pass that changed nothing adds nothing to it
+        if changed:
+            self._archive(merged, now)
+        return self._next_wakeup()
+
+    def _next_wakeup(self):
+        wait = self.scheduler.next_wakeup(self.leagues, self.watched())
+        if self.discovery_interval is not None and self.discovered_at is not None:
+            wait = min(wait, max(self.discovered_at + self.discovery_interval - time.time(), 0))
+        return wait
+
+    def _discover(self):
+        """Whole-board pass when one is due: schedule new leagues, keep props without a league.
+
+        Returns whether the held frames changed.
+        """
+        now = time.time()
+        if self.discovery_interval is None or (
+                self.discovered_at is not None and now - self.discovered_at < self.discovery_interval):
+            return False
+        self.discovered_at = now
+        self.scheduler.spend(1, now)
+        try:
+            with self.session.get(self.url, timeout=self.timeout, stream=True) as response:
+                response.raise_for_status()
+                frame = ingest_stream(response.iter_content(chunk_size=65536))
+        except (requests.RequestException, ValueError) as exc:
+            self.last_error = f"league discovery failed: {str(exc) or type(exc).__name__}"
+            return False
+
+        league_ids = frame['league_id'].unique()
+        with self._lock:
+            self.leagues.extend(
+                league_id for league_id in league_ids if league_id != NO_LEAGUE and league_id not in self.leagues
+            )
+            self._frames[NO_LEAGUE] = (now, frame[frame['league_id'] == NO_LEAGUE].reset_index(drop=True))
+        return True
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+
+class FilterIndex:
+    """Row positions for the board filters, built once per snapshot.
+
+    Everything is stored in hit-rate rank order, so any combination of
+    filters is an intersection of sorted rank arrays and comes back
+    already sorted best-first.
+    """
+
+    def __init__(self, board):
+        hit_rate = board['hit_rate'].to_numpy()
+        # Board positions sorted by hit rate, best first
+        self.order = np.argsort(-hit_rate, kind='stable')
+        self.size = len(self.order)
+
+        # Flags laid out in rank order
+        self.is_team = board['is_team'].to_numpy(dtype=bool)[self.order]
+        self.recommended = board['recommendation'].to_numpy()[self.order] == 'MORE'
+
+        # Ranks of every row in each league
+        codes, leagues = pd.factorize(board['league_id'].to_numpy()[self.order])
+        grouping = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[grouping], np.arange(len(leagues) + 1))
+        self.league_ranks = {
+            league: grouping[bounds[code]:bounds[code + 1]]
+            for code, league in enumerate(leagues)
+        }
+        self._cache = {}
+
+    @property
+    def leagues(self):
+        return sorted(self.league_ranks)
+
+    def ranks(self, leagues=None, include_teams=True, recommended_only=False):
+        """Sorted ranks of the rows that pass every filter"""
+        key = (tuple(sorted(leagues)) if leagues else None, include_teams, recommended_only)
+        # Shared across sessions and feed threads: another thread may clear the cache between a check and a read
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        if leagues:
+            parts = [self.league_ranks[league] for league in leagues if league in self.league_ranks]
+            ranks = np.sort(np.concatenate(parts)) if parts else np.array([], dtype=np.intp)
+        else:
+            ranks = np.arange(self.size)
+
+        if not include_teams:
+            ranks = ranks[~self.is_team[ranks]]
+        if recommended_only:
+            ranks = ranks[self.recommended[ranks]]
+
+        # Keep the cache small; combinations are cheap to rebuild
+        if len(self._cache) > 64:
+            self._cache.clear()
+        self._cache[key] = ranks
+        return ranks
+
+    def positions(self, leagues=None, include_teams=True, recommended_only=False):
+        """Board positions that pass every filter, best hit rate first"""
+        return self.order[self.ranks(leagues, include_teams, recommended_only)]
+
+    def query(self, board, leagues=None, include_teams=True, recommended_only=False):
+        """Rows of board that pass every filter, best hit rate first"""
+        return board.take(self.positions(leagues, include_teams, recommended_only))
@@ -0,0 +1,294 @@
+import codecs
+import json
+
+import numpy as np
+import pandas as pd
+
+# Parse state for the incremental payload reader
+_START, _KEY, _COLON, _VALUE, _ITEM, _ITEM_SEP, _MEMBER_SEP, _DONE = range(8)
+
+_WHITESPACE = ' \t\r\n'
+_decoder = json.JSONDecoder()
+
+
+# Included resource types joined onto projections, and the attributes kept
+INCLUDED_ATTRIBUTES = {
+    'new_player': ('name', 'team', 'position'),
+    'game': ('start_time', 'home_team', 'away_team'),
+}
+
+
+def _related_id(relationships, name):
+    data = (relationships.get(name) or {}).get('data')
+    return str(data['id']) if data and data.get('id') is not None else None
+
+
+class IncludedIndex:
+    """id-keyed hash tables over a payload's included resources"""
+
+    def __init__(self):
+        self.tables = {kind: {} for kind in INCLUDED_ATTRIBUTES}
+
+    def add(self, resource):
+        table = self.tables.get(resource.get('type'))
+        if table is None or resource.get('id') is None:
+            return
+        attrs = resource.get('attributes') or {}
+        table[str(resource['id'])] = [attrs.get(name) for name in INCLUDED_ATTRIBUTES[resource['type']]]
+
+    def frame(self, kind):
+        """One resource type as a frame indexed by id"""
+        table = self.tables[kind]
+        return pd.DataFrame.from_dict(table, orient='index', columns=list(INCLUDED_ATTRIBUTES[kind])) \
+            if table else pd.DataFrame(columns=list(INCLUDED_ATTRIBUTES[kind]), dtype=object)
+
+
+class ProjectionColumns:
+    """Typed column buffers filled one projection at a time"""
+
+    def __init__(self, capacity=4096):
+        self.size = 0
+        self.line = np.empty(capacity, dtype=np.float64)
+        self.projection_id = []
+        self.league_id = []
+        self.player_name = []
+        self.stat_type = []
+        self.player_id = []
+        self.game_id = []
+        self.description = []
+        self.start_time = []
+
+    def append(self, item):
+        """Add one JSON:API projection, skipping items without a line or a player"""
+        attrs = item.get('attributes') or {}
+        line_score = attrs.get('line_score')
+        if line_score is None:
+            return
+        try:
+            line = float(line_score)
+        except (TypeError, ValueError):
+            return
+
+        relationships = item.get('relationships') or {}
+        player_id = _related_id(relationships, 'new_player')
+        # The joined player resource names the prop when there is one
+        player_name = (attrs.get('name') or attrs.get('description') or '').strip()
+        if not player_name and player_id is None:
+            return
+
+        league_id = _related_id(relationships, 'league') or 'unknown'
+        game_id = _related_id(relationships, 'game') or attrs.get('game_id')
+
+        if self.size == len(self.line):
+            self.line = np.resize(self.line, 2 * len(self.line))
+        self.line[self.size] = line
+        self.size += 1
+
+        self.projection_id.append(str(item.get('id', '')))
+        self.league_id.append(league_id)
+        self.player_name.append(player_name)
+        self.stat_type.append(attrs.get('stat_type', 'Unknown'))
+        self.player_id.append(player_id)
+        self.game_id.append(None if game_id is None else str(game_id))
+        self.description.append(attrs.get('description'))
+        self.start_time.append(attrs.get('start_time'))
+
+    def to_frame(self, included=None):
+        """Hand the buffers to pandas, hash-joining the included player and game resources"""
+        frame = pd.DataFrame({
+            'projection_id': self.projection_id,
+            'league_id': self.league_id,
+            'player_name': self.player_name,
+            'line': self.line[:self.size].copy(),
+            'stat_type': self.stat_type,
+        })
+        return resolve_included(frame, self, included or IncludedIndex())
+
+
+def resolve_included(frame, columns, included):
+    """Add player_id, team, position, opponent, game_id and start_time from the included resources"""
+    links = pd.DataFrame({
+        'player_id': pd.Series(columns.player_id, dtype=object),
+        'game_id': pd.Series(columns.game_id, dtype=object),
+    })
+    players = links[['player_id']].join(included.frame('new_player'), on='player_id')
+    games = links[['game_id']].join(included.frame('game'), on='game_id')
+
+    resolved = players['name'].notna().to_numpy()
+    names = np.where(resolved, players['name'].to_numpy(dtype=object), frame['player_name'].to_numpy(dtype=object))
+    keep = resolved | (frame['player_name'].to_numpy(dtype=object) != '')
+
+    team = players['team'].to_numpy(dtype=object)
+    home, away = games['home_team'].to_numpy(dtype=object), games['away_team'].to_numpy(dtype=object)
+    opponent = np.where(team == home, away, np.where(team == away, home, None))
+    # Without a game resource the description names the opponent, once the player came from the join
+    description = np.array(columns.description, dtype=object)
+    opponent = np.where(pd.isna(opponent) & resolved & (description != names), description, opponent)
+
+    start_time = np.array(columns.start_time, dtype=object)
+    start_time = np.where(pd.isna(start_time), games['start_time'].to_numpy(dtype=object), start_time)
+    start_time = pd.to_datetime(pd.Series(start_time), utc=True, errors='coerce', format='ISO8601').dt.tz_localize(None)
+
+    frame = frame.assign(
+        player_name=names,
+        player_id=links['player_id'],
+        team=team,
+        position=players['position'].to_numpy(dtype=object),
+        opponent=opponent,
+        game_id=links['game_id'],
+        start_time=start_time.to_numpy(),
+    )
+    return frame[keep].reset_index(drop=True) if not keep.all() else frame
+
+
+def iter_json_members(chunks, array_keys=('data',)):
+    """Incrementally parse a top-level JSON object from byte chunks.
+
+    Yields (key, element) for every element of the arrays named in
+    array_keys and (key, value) for every other member, holding only the
+    unparsed tail of the body in memory.
+    """
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    buf = ''
+    pos = 0
+    state = _START
+    key = None
+    # Buffer length at which a failed decode is worth retrying
+    retry_at = 0
+    chunks = iter(chunks)
+    eof = False
+
+    while state != _DONE:
+        # Drop the consumed prefix once it gets large
+        if pos > 65536:
+            buf = buf[pos:]
+            retry_at -= pos
+            pos = 0
+
+        while pos < len(buf) and buf[pos] in _WHITESPACE:
+            pos += 1
+
+        if pos >= len(buf) or len(buf) < retry_at:
+            if eof:
+                raise ValueError('Truncated JSON payload')
+            try:
+                chunk = next(chunks)
+            except StopIteration:
+                eof = True
+                buf += text_decoder.decode(b'', final=True)
+                retry_at = 0
+                continue
+            buf += text_decoder.decode(chunk)
+            continue
+
+        char = buf[pos]
+        if state == _START:
+            if char != '{':
+                raise ValueError('Expected a JSON object payload')
+            pos += 1
+            state = _KEY
+        elif state == _KEY:
+            if char == '}':
+                pos += 1
+                state = _DONE
+                continue
+            parsed = _try_decode(buf, pos, eof)
+            if parsed is None:
+                retry_at = pos + 2 * (len(buf) - pos)
+                continue
+            key, pos = parsed
+            state = _COLON
+        elif state == _COLON:
+            if char != ':':
+                raise ValueError(f'Expected ":" after key {key!r}')
+            pos += 1
+            state = _VALUE
+        elif state == _VALUE:
+            if key in array_keys and char == '[':
+                pos += 1
+                state = _ITEM
+                continue
+            parsed = _try_decode(buf, pos, eof)
+            if parsed is None:
+                retry_at = pos + 2 * (len(buf) - pos)
+                continue
+            value, pos = parsed
+            yield key, value
+            state = _MEMBER_SEP
+        elif state == _ITEM:
+            if char == ']':
+                pos += 1
+                state = _MEMBER_SEP
+                continue
+            parsed = _try_decode(buf, pos, eof)
+            if parsed is None:
+                retry_at = pos + 2 * (len(buf) - pos)
+                continue
+            value, pos = parsed
+            yield key, value
+            state = _ITEM_SEP
+        elif state == _ITEM_SEP:
+            pos += 1
+            if char == ']':
+                state = _MEMBER_SEP
+            elif char == ',':
+                state = _ITEM
+            else:
+                raise ValueError(f'Unexpected {char!r} in array {key!r}')
+        elif state == _MEMBER_SEP:
+            pos += 1
+            if char == '}':
+                state = _DONE
+            elif char == ',':
+                state = _KEY
+            else:
+                raise ValueError(f'Unexpected {char!r} after member {key!r}')
+
+
+def _try_decode(buf, pos, eof):
+    """Decode one JSON value at pos, or None if more input is needed"""
+    try:
+        value, end = _decoder.raw_decode(buf, pos)
+    except json.JSONDecodeError:
+        if eof:
+            raise
+        return None
+    # A number running into the end of the buffer may still be incomplete
+    if end == len(buf) and not eof:
+        return None
+    return value, end
+
+
+def ingest_stream(chunks, members=None, item_ids=None):
+    """Build the raw projections frame from a streamed response body.
+
+    Other top-level members (links, meta) are stored in members if a dict
+    is given, and the id of every data item, kept or skipped, is appended
+    to item_ids if a list is given.
+    """
+    columns = ProjectionColumns()
+    included = IncludedIndex()
+    for key, item in iter_json_members(chunks, array_keys=('data', 'included')):
+        if key == 'data':
+            if isinstance(item, dict):
+                if item_ids is not None:
+                    item_ids.append(str(item.get('id', '')))
+                columns.append(item)
+        elif key == 'included':
+            if isinstance(item, dict):
+                included.add(item)
+        elif members is not None:
+            members[key] = item
+    return columns.to_frame(included)
+
+
+def ingest_payload(data):
+    """Build the raw projections frame from an already decoded payload"""
+    items = data.get('data', [])
+    columns = ProjectionColumns(capacity=max(len(items), 1))
+    for item in items:
+        columns.append(item)
+    included = IncludedIndex()
+    for resource in data.get('included') or []:
+        included.add(resource)
+    return columns.to_frame(included)
@@ -0,0 +1,180 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import defaultdict, deque
+from contextlib import nullcontext
+
+import numpy as np
+import pandas as pd
+
+PROFILE_LOG = os.environ.get(
+    'PRIZEPICKS_PROFILE_LOG', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'profile.jsonl')
+)
+
+# Reruns kept per stage for the rolling percentiles
+ROLLING_WINDOW = 200
+
+# Handed out when profiling is off, so a disabled stage costs one lookup
+_DISABLED = nullcontext()
+
+# The profiler of the rerun running on this thread and the misses of the open cached stage
+_local = threading.local()
+
+
+def stage(name, cached=False):
+    """Time a block of the current rerun; a no-op unless a profiler is active"""
+    profiler = getattr(_local, 'profiler', None)
+    if profiler is None:
+        return _DISABLED
+    return _Stage(profiler, name, cached)
+
+
+def mark_miss(name):
+    """Call from inside a cached function body: it only runs on a cache miss"""
+    misses = getattr(_local, 'misses', None)
+    if misses is not None:
+        misses.add(name)
+
+
+class _Stage:
+    __slots__ = ('profiler', 'name', 'cached', 'outer_misses', 'base', 'peak', 'started')
+
+    def __init__(self, profiler, name, cached):
+        self.profiler = profiler
+        self.name = name
+        self.cached = cached
+
+    def __enter__(self):
+        if self.cached:
+            self.outer_misses = getattr(_local, 'misses', None)
+            _local.misses = set()
+        if self.profiler.trace_memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            # Resetting the peak would hide it from enclosing stages, so hand it to them first
+            for outer in self.profiler.stack:
+                outer.peak = max(outer.peak, peak)
+            tracemalloc.reset_peak()
+            self.base = self.peak = current
+        else:
+            self.base = None
+        self.profiler.stack.append(self)
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.started
+        self.profiler.stack.pop()
+        peak_bytes = None
+        if self.base is not None and tracemalloc.is_tracing():
+            peak_bytes = max(self.peak, tracemalloc.get_traced_memory()[1]) - self.base
+        hit = None
+        if self.cached:
+            misses = _local.misses
+            _local.misses = self.outer_misses
+            if self.outer_misses is not None:
+                self.outer_misses |= misses
+            hit = self.name not in misses
+        self.profiler.record(self.name, elapsed, peak_bytes, hit)
+        return False
+
+
+class Profiler:
+    """Per-stage timings of Streamlit reruns with rolling p50/p95.
+
+    Stages are opened with stage(name) anywhere in the rerun's thread;
+    peak memory comes from tracemalloc when trace_memory is on, and a
+    stage opened with cached=True counts a hit unless mark_miss(name) ran
+    inside it. Finished reruns can be appended to a JSONL file.
+    """
+
+    def __init__(self, window=ROLLING_WINDOW):
+        self.enabled = False
+        self.trace_memory = False
+        self.log_path = None
+        self.durations = defaultdict(lambda: deque(maxlen=window))
+        self.peaks = {}
+        self.cache = defaultdict(lambda: [0, 0])
+        self.stack = []
+        self.runs = 0
+        self.current = None
+        self._started = None
+        self._owns_tracing = False
+
+    def configure(self, enabled, trace_memory=False, log_path=None):
+        self.enabled = enabled
+        self.trace_memory = enabled and trace_memory
+        self.log_path = log_path if enabled else None
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracing = True
+        elif not self.trace_memory and self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+
+    def start_run(self):
+        """Begin a rerun; makes this profiler the active one on the current thread"""
+        _local.profiler = self if self.enabled else None
+        _local.misses = None
+        self.stack = []
+        if not self.enabled:
+            self.current = None
+            return
+        self.current = {}
+        self._started = time.perf_counter()
+
+    def record(self, name, seconds, peak_bytes=None, hit=None):
+        self.durations[name].append(seconds)
+        if peak_bytes is not None:
+            self.peaks[name] = peak_bytes
+        if hit is not None:
+            self.cache[name][0 if hit else 1] += 1
+        if self.current is not None:
+            entry = self.current.setdefault(name, {'ms': 0.0})
+            entry['ms'] += seconds * 1000
+            if peak_bytes is not None:
+                entry['peak_kib'] = max(entry.get('peak_kib', 0), peak_bytes / 1024)
+            if hit is not None:
+                entry['cache'] = 'hit' if hit else 'miss'
+
+    def finish_run(self):
+        """Close the rerun started by start_run and log it"""
+        _local.profiler = None
+        if self.current is None:
+            return
+        total = time.perf_counter() - self._started
+        self.durations['total'].append(total)
+        self.runs += 1
+        if self.log_path:
+            record = {'at': time.time(), 'run': self.runs, 'total_ms': round(total * 1000, 3), 'stages': {
+                name: {k: round(v, 3) if isinstance(v, float) else v for k, v in entry.items()}
+                for name, entry in self.current.items()
+            }}
+            with open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record) + '\n')
+        self.current = None
+
+    def stats(self):
+        """One row per stage: rolling p50/p95 in ms, last peak memory and cache counts"""
+        rows = []
+        for name, durations in self.durations.items():
+            values = np.fromiter(durations, dtype=np.float64, count=len(durations)) * 1000
+            hits, misses = self.cache[name] if name in self.cache else (None, None)
+            rows.append({
+                'stage': name,
+                'runs': len(values),
+                'last_ms': values[-1],
+                'p50_ms': np.percentile(values, 50),
+                'p95_ms': np.percentile(values, 95),
+                'peak_kib': self.peaks[name] / 1024 if name in self.peaks else np.nan,
+                'cache_hits': hits,
+                'cache_misses': misses,
+            })
+        return pd.DataFrame(rows).astype({'cache_hits': 'Int64', 'cache_misses': 'Int64'}) if rows else pd.DataFrame(rows)
+
+    def reset(self):
+        self.durations.clear()
+        self.peaks.clear()
+        self.cache.clear()
+        self.runs = 0
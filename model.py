@@ -0,0 +1,156 @@
+"""Empirical hit-rate model compiled to dense lookup tables.
+
+Fit offline from graded props, then score with integer-coded array
+lookups:
+
+    python model.py fit results.csv -o hit_rate_model.npz
+
+The results file needs sport, stat_type, line and actual columns (a
+league_id column can stand in for sport). The table holds P(MORE);
+pushes are left out, so P(LESS) is its complement, which
+scoring.pick_probabilities takes care of.
+"""
+import argparse
+import os
+import sys
+import time
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+MODEL_PATH = os.environ.get(
+    'PRIZEPICKS_MODEL_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'hit_rate_model.npz')
+)
+
+# Line bucket edges; bucket i holds edges[i-1] < line <= edges[i]
+MODEL_LINE_EDGES = np.array([1.0, 2.0, 3.0, 5.0, 10.0, 15.0, 20.0, 30.0, 50.0])
+
+# Pseudo-observations pulling a sparse cell toward its parent
+PRIOR_STRENGTH = 20.0
+
+
+class HitRateModel:
+    """Dense (sport, stat_type, line bucket) table of MORE hit rates.
+
+    The last sport row and last stat column hold the pooled rates used
+    for sports and stat types the fit never saw.
+    """
+
+    def __init__(self, table, sports, stat_types, edges=MODEL_LINE_EDGES):
+        self.table = np.asarray(table, dtype=np.float32)
+        self.sports = pd.Index(sports)
+        self.stat_types = pd.Index(stat_types)
+        self.edges = np.asarray(edges, dtype=np.float64)
+
+    @classmethod
+    def load(cls, path=MODEL_PATH):
+        with np.load(path, allow_pickle=False) as data:
+            table = data['table']
+            # Older fits kept a MORE/LESS axis; LESS was always the complement
+            if table.ndim == 4:
+                table = table[..., 0]
+            return cls(table, data['sports'], data['stat_types'], data['edges'])
+
+    def save(self, path=MODEL_PATH):
+        np.savez_compressed(
+            path, table=self.table, sports=self.sports.to_numpy(dtype=str),
+            stat_types=self.stat_types.to_numpy(dtype=str), edges=self.edges,
+        )
+
+    def codes(self, sports, stat_types, lines):
+        """Integer codes into the table for arrays of props"""
+        sport_codes = self.sports.get_indexer(pd.Index(sports))
+        sport_codes[sport_codes < 0] = len(self.sports)
+        stat_codes = self.stat_types.get_indexer(pd.Index(stat_types))
+        stat_codes[stat_codes < 0] = len(self.stat_types)
+        buckets = np.digitize(np.asarray(lines, dtype=np.float64), self.edges, right=True)
+        return sport_codes, stat_codes, buckets
+
+    def hit_rates(self, sports, stat_types, lines):
+        """MORE hit rate for every prop, as a pure table lookup"""
+        sport_codes, stat_codes, buckets = self.codes(sports, stat_types, lines)
+        return self.table[sport_codes, stat_codes, buckets].astype(np.float64)
+
+
+@lru_cache(maxsize=1)
+def load_default_model(path=MODEL_PATH):
+    """The fitted model at MODEL_PATH, loaded once, or None if there isn't one"""
+    if not os.path.exists(path):
+        return None
+    try:
+        return HitRateModel.load(path)
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _smooth(hits, trials, prior):
+    return (hits + PRIOR_STRENGTH * prior) / (trials + PRIOR_STRENGTH)
+
+
+def fit(results, edges=MODEL_LINE_EDGES):
+    """Fit the lookup table from a frame of graded props"""
+    results = results.dropna(subset=['sport', 'stat_type', 'line', 'actual'])
+    sport_codes, sports = pd.factorize(results['sport'].astype(str), sort=True)
+    stat_codes, stat_types = pd.factorize(results['stat_type'].astype(str), sort=True)
+    lines = results['line'].to_numpy(dtype=np.float64)
+    actual = results['actual'].to_numpy(dtype=np.float64)
+    buckets = np.digitize(lines, edges, right=True)
+
+    n_sports, n_stats, n_buckets = len(sports), len(stat_types), len(edges) + 1
+    shape = (n_sports, n_stats, n_buckets)
+    flat = np.ravel_multi_index((sport_codes, stat_codes, buckets), shape)
+    decided = actual != lines
+
+    hits = np.bincount(flat, weights=actual > lines, minlength=np.prod(shape)).reshape(shape)
+    trials = np.bincount(flat, weights=decided, minlength=np.prod(shape)).reshape(shape)
+
+    # Shrink each level toward its parent: overall -> bucket -> sport/bucket -> cell
+    overall = _smooth(hits.sum(), trials.sum(), 0.5)
+    by_bucket = _smooth(hits.sum(axis=(0, 1)), trials.sum(axis=(0, 1)), overall)
+    by_sport = _smooth(hits.sum(axis=1), trials.sum(axis=1), by_bucket[None])
+    cells = _smooth(hits, trials, by_sport[:, None])
+
+    table = np.empty((n_sports + 1, n_stats + 1, n_buckets))
+    table[:n_sports, :n_stats] = cells
+    table[:n_sports, n_stats] = by_sport
+    table[n_sports, :] = by_bucket[None]
+    return HitRateModel(table, sports, stat_types, edges)
+
+
+def read_results(path):
+    """Load a graded results file, mapping league_id to sport if needed"""
+    results = pd.read_csv(path, dtype={'league_id': str, 'sport': str, 'stat_type': str})
+    if 'sport' not in results and 'league_id' in results:
+        from constants import LEAGUE_MAPPING
+        results['sport'] = results['league_id'].map(LEAGUE_MAPPING).fillna('Other')
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    fit_cmd = commands.add_parser('fit', help='fit the model from a graded results CSV')
+    fit_cmd.add_argument('results')
+    fit_cmd.add_argument('-o', '--output', default=MODEL_PATH)
+    show_cmd = commands.add_parser('show', help='print a fitted model')
+    show_cmd.add_argument('model', nargs='?', default=MODEL_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == 'fit':
+        started = time.perf_counter()
+        results = read_results(args.results)
+        model = fit(results)
+        model.save(args.output)
+        print(f"Fitted {len(results):,} props -> {len(model.sports)} sports x "
+              f"{len(model.stat_types)} stat types in {time.perf_counter() - started:.2f}s: {args.output}")
+    else:
+        model = HitRateModel.load(args.model)
+        pooled = model.table[:-1, -1]
+        for sport, rates in zip(model.sports, pooled):
+            print(f"{sport:>16}: MORE {' '.join(f'{r:.3f}' for r in rates)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,134 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Line changes remembered per projection
+HISTORY_LENGTH = 16
+INITIAL_CAPACITY = 4096
+
+
+class LineMovementTracker:
+    """Fixed-size ring buffer of (timestamp, line) per projection id.
+
+    Rows of two 2-D arrays are handed out as slots; a slot is freed when
+    its projection leaves the board, so memory is bounded by the largest
+    board seen times HISTORY_LENGTH.
+    """
+
+    def __init__(self, capacity=INITIAL_CAPACITY, history=HISTORY_LENGTH):
+        self.history = history
+        self.times = np.full((capacity, history), np.nan)
+        self.lines = np.full((capacity, history), np.nan, dtype=np.float32)
+        # Next write position and number of valid entries per slot
+        self.heads = np.zeros(capacity, dtype=np.int32)
+        self.counts = np.zeros(capacity, dtype=np.int32)
+        self.slots = {}
+        self.free = list(range(capacity - 1, -1, -1))
+        self.version = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.slots)
+
+    def _grow(self):
+        old = len(self.heads)
+        self.times = np.vstack([self.times, np.full((old, self.history), np.nan)])
+        self.lines = np.vstack([self.lines, np.full((old, self.history), np.nan, dtype=np.float32)])
+        self.heads = np.concatenate([self.heads, np.zeros(old, dtype=np.int32)])
+        self.counts = np.concatenate([self.counts, np.zeros(old, dtype=np.int32)])
+        self.free.extend(range(2 * old - 1, old - 1, -1))
+
+    def _slots_for(self, ids):
+        slots = np.empty(len(ids), dtype=np.intp)
+        for i, pid in enumerate(ids):
+            slot = self.slots.get(pid)
+            if slot is None:
+                if not self.free:
+                    self._grow()
+                slot = self.slots[pid] = self.free.pop()
+            slots[i] = slot
+        return slots
+
+    def record(self, ids, lines, timestamp):
+        """Append the current line for each id"""
+        if not len(ids):
+            return
+        slots = self._slots_for(ids)
+        heads = self.heads[slots]
+        self.times[slots, heads] = timestamp
+        self.lines[slots, heads] = lines
+        self.heads[slots] = (heads + 1) % self.history
+        self.counts[slots] = np.minimum(self.counts[slots] + 1, self.history)
+
+    def evict(self, ids):
+        """Free the slots of projections that left the board"""
+        slots = [self.slots.pop(pid) for pid in ids if pid in self.slots]
+        if not slots:
+            return
+        self.times[slots] = np.nan
+        self.lines[slots] = np.nan
+        self.heads[slots] = 0
+        self.counts[slots] = 0
+        self.free.extend(slots)
+
+    def observe(self, board, changes, timestamp):
+        """Apply a snapshot ChangeSet once; later calls for the same version are no-ops"""
+        with self._lock:
+            if changes.version <= self.version:
+                return
+            self.evict(changes.removed)
+            moved = changes.added.append(changes.line_moves.index)
+            self.record(moved, board['line'].reindex(moved).to_numpy(), timestamp)
+            self.version = changes.version
+
+    def _latest_index(self, slots):
+        return (self.heads[slots] - 1) % self.history
+
+    def movements(self, window_seconds, now):
+        """Line change over the window for every tracked projection.
+
+        The baseline is the newest entry at or before the window start, or
+        the oldest entry if the projection appeared inside the window.
+        """
+        with self._lock:
+            ids = pd.Index(list(self.slots), name='projection_id')
+            slots = np.fromiter(self.slots.values(), dtype=np.intp, count=len(self.slots))
+            times = self.times[slots]
+            lines = self.lines[slots]
+            latest = self._latest_index(slots)
+            counts = self.counts[slots]
+
+        columns = ['line', 'previous_line', 'delta', 'direction', 'seconds_since_change']
+        if not len(slots):
+            return pd.DataFrame(columns=columns, index=ids)
+
+        rows = np.arange(len(slots))
+        valid = ~np.isnan(times)
+        cutoff = now - window_seconds
+
+        before = np.where(valid & (times <= cutoff), times, -np.inf)
+        has_before = np.isfinite(before.max(axis=1))
+        oldest = np.argmin(np.where(valid, times, np.inf), axis=1)
+        baseline = np.where(has_before, np.argmax(before, axis=1), oldest)
+
+        current = lines[rows, latest].astype(np.float64)
+        previous = lines[rows, baseline].astype(np.float64)
+        delta = current - previous
+        # The newest entry is the last change once a line has moved at least once
+        changed_at = np.where(counts > 1, times[rows, latest], np.nan)
+
+        return pd.DataFrame({
+            'line': current,
+            'previous_line': previous,
+            'delta': delta,
+            'direction': np.sign(delta).astype(np.int8),
+            'seconds_since_change': now - changed_at,
+        }, index=ids)
+
+    def biggest_movers(self, window_seconds, now, top=20):
+        """Projections whose line moved the most over the window"""
+        moves = self.movements(window_seconds, now)
+        moves = moves[moves['delta'] != 0]
+        order = np.argsort(-moves['delta'].abs().to_numpy(), kind='stable')[:top]
+        return moves.iloc[order]
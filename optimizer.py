@@ -0,0 +1,218 @@
+import heapq
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from scoring import pick_probabilities
+
+# Payout multipliers by number of legs, then by number of legs hit
+POWER_PAYOUTS = {
+    2: {2: 3.0},
+    3: {3: 5.0},
+    4: {4: 10.0},
+    5: {5: 20.0},
+    6: {6: 37.5},
+}
+FLEX_PAYOUTS = {
+    3: {3: 2.25, 2: 1.25},
+    4: {4: 5.0, 3: 1.5},
+    5: {5: 10.0, 4: 2.0, 3: 0.4},
+    6: {6: 25.0, 5: 2.0, 4: 0.4},
+}
+PAYOUT_TABLES = {'Power': POWER_PAYOUTS, 'Flex': FLEX_PAYOUTS}
+
+MIN_LEGS = 2
+MAX_LEGS = 6
+
+# Entry constraints
+DEFAULT_TOP_K = 5
+DEFAULT_MAX_PER_TEAM = 2
+
+
+@dataclass(frozen=True)
+class Entry:
+    """One candidate entry and its expected value per $1 staked"""
+    projection_ids: tuple
+    probabilities: tuple
+    ev: float
+
+    @property
+    def win_probability(self):
+        """Chance that every leg hits"""
+        return float(np.prod(self.probabilities))
+
+
+def payout_vector(num_legs, mode='Power', payouts=None):
+    """Multiplier for 0..num_legs hits under a payout table"""
+    table = (payouts or PAYOUT_TABLES[mode]).get(num_legs)
+    if table is None:
+        raise ValueError(f"No {mode} payout for {num_legs} legs")
+    vector = np.zeros(num_legs + 1)
+    for hits, multiplier in table.items():
+        vector[hits] = multiplier
+    return vector
+
+
+def hit_distribution(probabilities):
+    """P(k legs hit) for independent legs (Poisson binomial)"""
+    dist = np.zeros(len(probabilities) + 1)
+    dist[0] = 1.0
+    for n, p in enumerate(probabilities, start=1):
+        dist[1:n + 1] = dist[1:n + 1] * (1 - p) + dist[:n] * p
+        dist[0] *= 1 - p
+    return dist
+
+
+def expected_value(probabilities, payout):
+    """Expected profit per $1 for independent legs"""
+    return float(hit_distribution(probabilities) @ payout) - 1.0
+
+
+def _last_positions(codes):
+    """Per position, the last position holding the same code"""
+    last = pd.Series(codes).drop_duplicates(keep='last')
+    positions = np.empty(codes.max() + 1 if len(codes) else 0, dtype=np.int64)
+    positions[last.to_numpy()] = last.index.to_numpy()
+    return positions[codes]
+
+
+class SuffixCapacity:
+    """How many more legs the candidates from a position on could fill.
+
+    Candidates come as player codes and team codes (-1 for no team). From
+    position i on there are players[i] distinct players and slots[i]
+    distinct (player, team) pairs once each team is capped at
+    max_per_team; left() takes the legs already chosen off both.
+    """
+
+    def __init__(self, player_codes, team_codes, max_per_team):
+        n = len(player_codes)
+        self.team_codes = team_codes
+        self.max_per_team = max_per_team
+        self.player_last = _last_positions(player_codes)
+        pair_codes = player_codes.astype(np.int64) * (team_codes.max(initial=-1) + 2) + team_codes + 1
+        self.pair_last = _last_positions(pair_codes)
+
+        last_pairs = np.flatnonzero(self.pair_last == np.arange(n))
+        pair_teams = team_codes[last_pairs]
+        # Rank of each pair within its team, counted from the end
+        from_end = pd.Series(pair_teams).groupby(pair_teams).cumcount(ascending=False).to_numpy()
+        fits = np.zeros(n + 1, dtype=np.int64)
+        fits[last_pairs] = (pair_teams < 0) | (from_end < max_per_team)
+        firsts = np.zeros(n + 1, dtype=np.int64)
+        firsts[:n] = self.player_last == np.arange(n)
+        self.players = np.cumsum(firsts[::-1])[::-1]
+        self.slots = np.cumsum(fits[::-1])[::-1]
+        self._last_pairs, self._pair_teams = last_pairs, pair_teams
+        self._team_lasts = {}
+
+    def team_slots(self, team, start):
+        """Distinct players of a team from start on"""
+        positions = self._team_lasts.get(team)
+        if positions is None:
+            positions = self._team_lasts[team] = self._last_pairs[self._pair_teams == team]
+        return len(positions) - int(np.searchsorted(positions, start))
+
+    def left(self, start, chosen):
+        """Upper bound on the legs positions start.. can add to chosen"""
+        players = int(self.players[start]) - sum(int(self.player_last[j]) >= start for j in chosen)
+        slots = int(self.slots[start])
+        by_team = {}
+        for j in chosen:
+            team = int(self.team_codes[j])
+            used = by_team.get(team, (0, 0))
+            by_team[team] = (used[0] + 1, used[1] + (int(self.pair_last[j]) >= start))
+        for team, (taken, counted) in by_team.items():
+            if team < 0:
+                slots -= counted
+                continue
+            remaining = self.team_slots(team, start)
+            slots -= min(remaining, self.max_per_team) - max(min(remaining - counted, self.max_per_team - taken), 0)
+        return min(players, slots)
+
+
+def optimize_entries(board, num_legs, mode='Power', top_k=DEFAULT_TOP_K,
+                     max_per_team=DEFAULT_MAX_PER_TEAM, payouts=None,
+                     team_column='team_code', player_column='player_name'):
+    """Top-k entries by expected value over every prop on the board.
+
+    Branch and bound over props sorted by pick probability: payouts never
+    decrease with more hits, so padding a partial entry with the next
+    candidate's probability bounds every completion below it. Branches
+    whose remaining players and team slots cannot fill the entry are cut,
+    so a board the limits make infeasible returns no entries at once.
+    """
+    if not MIN_LEGS <= num_legs <= MAX_LEGS:
+        raise ValueError(f"Entries need {MIN_LEGS}-{MAX_LEGS} legs")
+    if top_k < 1:
+        raise ValueError("top_k must be at least 1")
+    payout = payout_vector(num_legs, mode, payouts)
+
+    probs = pick_probabilities(board['hit_rate'].to_numpy(), board['recommendation'].to_numpy())
+    order = np.argsort(-probs, kind='stable')
+    probs = probs[order].tolist()
+    ids = board.index.to_numpy()[order]
+    players = board[player_column].to_numpy()[order]
+    if team_column in board:
+        teams = board[team_column].to_numpy()[order]
+        # Categorical columns hand back NaN for players without a team
+        teams = np.where(pd.isna(teams), None, teams)
+    else:
+        teams = np.full(len(order), None, dtype=object)
+
+    team_codes = pd.factorize(board[team_column])[0][order] if team_column in board else np.full(len(order), -1)
+    player_codes = pd.factorize(board[player_column], use_na_sentinel=False)[0][order]
+    capacity = SuffixCapacity(player_codes, team_codes, max_per_team)
+    if capacity.left(0, []) < num_legs:
+        return []
+
+    # Min-heap of (ev, tiebreak, positions) holding the best entries so far
+    best = []
+    counter = 0
+    used_players = set()
+    team_counts = {}
+    chosen = []
+
+    def bound(start):
+        return expected_value([probs[i] for i in chosen] + [probs[start]] * (num_legs - len(chosen)), payout)
+
+    def search(start):
+        nonlocal counter
+        for i in range(start, len(probs) - (num_legs - len(chosen)) + 1):
+            if len(best) == top_k and bound(i) <= best[0][0]:
+                # Later candidates only have lower probabilities
+                return
+            if capacity.left(i, chosen) < num_legs - len(chosen):
+                # Nor can they offer more players or team slots
+                return
+            player, team = players[i], teams[i]
+            if player in used_players:
+                continue
+            if team is not None and team_counts.get(team, 0) >= max_per_team:
+                continue
+
+            chosen.append(i)
+            if len(chosen) == num_legs:
+                ev = expected_value([probs[j] for j in chosen], payout)
+                counter += 1
+                item = (ev, -counter, tuple(chosen))
+                if len(best) < top_k:
+                    heapq.heappush(best, item)
+                elif ev > best[0][0]:
+                    heapq.heapreplace(best, item)
+            else:
+                used_players.add(player)
+                if team is not None:
+                    team_counts[team] = team_counts.get(team, 0) + 1
+                search(i + 1)
+                used_players.discard(player)
+                if team is not None:
+                    team_counts[team] -= 1
+            chosen.pop()
+
+    search(0)
+    return [
+        Entry(tuple(ids[j] for j in positions), tuple(probs[j] for j in positions), ev)
+        for ev, _, positions in sorted(best, reverse=True)
+    ]
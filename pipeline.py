@@ -0,0 +1,202 @@
+"""Headless projections pipeline: load a snapshot, score it and pick entries.
+
+Importing this module has no side effects and never loads Streamlit;
+the network, archive and optimizer modules are imported on first use.
+
+    python pipeline.py --legs 6 --mode Power -o board.csv --entries entries.json
+    python pipeline.py --source archive --leagues 7 9 -o board.json
+
+Output format follows the file extension (.csv or .json); "-" writes
+JSON to stdout.
+"""
+import argparse
+import sys
+import time
+
+import pandas as pd
+
+from classify import classify_props
+from compact import compact_board, memory_report
+from constants import DEFAULT_EMOJI, LEAGUE_MAPPING, SPORT_EMOJI
+from instrument import stage
+from scoring import score_projections
+
+BOARD_COLUMNS = [
+    'league_id', 'sport', 'display_name', 'player_name', 'team_code', 'is_team',
+    'stat_type', 'line', 'hit_rate', 'recommendation',
+]
+
+# Columns joined from the payload's included resources, carried onto the board when present
+RESOLVED_COLUMNS = ['position', 'opponent', 'game_id', 'start_time']
+
+
+def derive_board(raw, compact=True):
+    """Add sport, emoji, team info and hit rates to raw projections"""
+    sport = raw['league_id'].map(LEAGUE_MAPPING).fillna('Other')
+    emoji = sport.map(SPORT_EMOJI).fillna(DEFAULT_EMOJI)
+
+    # Team info from the joined player resources, name heuristics for the rest
+    with stage('classify'):
+        display_name, team_code, is_team = classify_props(
+            raw['player_name'], sport, raw.get('team'), raw.get('position'),
+        )
+
+    board = pd.DataFrame({
+        'league_id': raw['league_id'],
+        'sport': sport,
+        'emoji': emoji,
+        'player_name': raw['player_name'],
+        'display_name': display_name,
+        'team_code': team_code,
+        'is_team': is_team,
+        'line': raw['line'],
+        'stat_type': raw['stat_type'],
+        **{name: raw[name] for name in RESOLVED_COLUMNS if name in raw},
+    }, index=raw.index)
+    with stage('score'):
+        board = score_projections(board)
+    return compact_board(board) if compact else board
+
+
+def build_board(raw):
+    """Scored board indexed by projection_id from a raw projections frame"""
+    return derive_board(raw.drop_duplicates('projection_id', keep='last').set_index('projection_id'))
+
+
+def fetch_live(url=None, timeout=None, archive=None, leagues=None):
+    """Download the current projections as (fetched_at, raw frame).
+
+    With leagues, only those are requested, in parallel and page by page.
+    """
+    from fetcher import PROJECTIONS_URL, REQUEST_TIMEOUT, BackgroundFetcher, LeagueFetcher
+
+    if leagues:
+        fetcher = LeagueFetcher(url or PROJECTIONS_URL, leagues=leagues, timeout=timeout or REQUEST_TIMEOUT, archive=archive)
+    else:
+        fetcher = BackgroundFetcher(url or PROJECTIONS_URL, timeout=timeout or REQUEST_TIMEOUT, archive=archive)
+    fetcher.refresh_once()
+    snapshot = fetcher.latest()
+    if snapshot is None:
+        raise RuntimeError(f"Fetch failed: {fetcher.last_error}")
+    return snapshot.fetched_at, snapshot.frame
+
+
+def load_archived(path=None, root=None):
+    """Read an archived snapshot (the newest one by default) as (fetched_at, raw frame)"""
+    from archive import ARCHIVE_DIR, SnapshotArchive
+
+    store = SnapshotArchive(root or ARCHIVE_DIR)
+    if path:
+        return store.load(path)
+    latest = store.latest()
+    if latest is None:
+        raise RuntimeError(f"No archived snapshots under {store.root}")
+    return latest
+
+
+def filter_board(board, leagues=None, include_teams=True, recommended_only=False):
+    """Board rows passing the filters, best hit rate first"""
+    from filters import FilterIndex
+
+    return FilterIndex(board).query(board, leagues, include_teams, recommended_only)
+
+
+def select_entries(board, num_legs, mode='Power', top_k=None, max_per_team=None):
+    """Best entries by expected value over the given board"""
+    from optimizer import DEFAULT_MAX_PER_TEAM, DEFAULT_TOP_K, optimize_entries
+
+    return optimize_entries(
+        board, num_legs, mode,
+        top_k=DEFAULT_TOP_K if top_k is None else top_k,
+        max_per_team=DEFAULT_MAX_PER_TEAM if max_per_team is None else max_per_team,
+    )
+
+
+def entries_frame(board, entries):
+    """One row per entry leg, ready to write out"""
+    rows = []
+    for rank, entry in enumerate(entries, 1):
+        for projection_id, probability in zip(entry.projection_ids, entry.probabilities):
+            leg = board.loc[projection_id]
+            rows.append({
+                'entry': rank,
+                'ev': entry.ev,
+                'win_probability': entry.win_probability,
+                'projection_id': projection_id,
+                'display_name': leg['display_name'],
+                'team_code': leg['team_code'],
+                'stat_type': leg['stat_type'],
+                'line': leg['line'],
+                'pick': leg['recommendation'],
+                'probability': probability,
+            })
+    return pd.DataFrame(rows)
+
+
+def write_frame(frame, path):
+    """Write a frame as CSV or JSON records depending on the path"""
+    if path == '-':
+        sys.stdout.write(frame.to_json(orient='records', indent=2) + '\n')
+    elif path.endswith('.csv'):
+        frame.to_csv(path, index=False)
+    else:
+        frame.to_json(path, orient='records', indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--source', choices=['live', 'archive'], default='live')
+    parser.add_argument('--snapshot', help='archived snapshot directory (default: newest)')
+    parser.add_argument('--archive-dir', help='archive root for --source archive or --save')
+    parser.add_argument('--save', action='store_true', help='archive a live snapshot after fetching it')
+    parser.add_argument('--leagues', nargs='*', default=[], help='league ids to keep (default: all)')
+    parser.add_argument('--no-teams', action='store_true', help='drop team props')
+    parser.add_argument('--recommended', action='store_true', help='keep only recommended props')
+    parser.add_argument('--legs', type=int, default=0, help='select entries with this many legs')
+    parser.add_argument('--mode', choices=['Power', 'Flex'], default='Power')
+    parser.add_argument('--top', type=int, default=None, help='number of entries to keep')
+    parser.add_argument('--max-per-team', type=int, default=None)
+    parser.add_argument('-o', '--output', help='write the filtered board (.csv or .json)')
+    parser.add_argument('--entries', help='write the selected entries (.csv or .json)')
+    parser.add_argument('--memory-report', action='store_true', help='compare the compact board with plain dtypes')
+    args = parser.parse_args(argv)
+    if args.top is not None and args.top < 1:
+        parser.error('--top must be at least 1')
+
+    started = time.perf_counter()
+    if args.source == 'live':
+        archive = None
+        if args.save:
+            from archive import ARCHIVE_DIR, SnapshotArchive
+            archive = SnapshotArchive(args.archive_dir or ARCHIVE_DIR)
+        fetched_at, raw = fetch_live(archive=archive, leagues=args.leagues)
+    else:
+        fetched_at, raw = load_archived(args.snapshot, args.archive_dir)
+
+    if args.memory_report:
+        unique = raw.drop_duplicates('projection_id', keep='last').set_index('projection_id')
+        report = memory_report(derive_board(unique, compact=False), derive_board(unique))
+        print(report.to_string(formatters={'ratio': '{:.2f}'.format}), file=sys.stderr)
+
+    board = filter_board(
+        build_board(raw), args.leagues, include_teams=not args.no_teams, recommended_only=args.recommended,
+    )
+    print(f"Scored {len(raw):,} props ({len(board):,} after filters) from "
+          f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(fetched_at))}", file=sys.stderr)
+
+    if args.output:
+        write_frame(board[BOARD_COLUMNS].rename_axis('projection_id').reset_index(), args.output)
+
+    if args.legs:
+        entries = select_entries(board, args.legs, args.mode, args.top, args.max_per_team)
+        for rank, entry in enumerate(entries, 1):
+            print(f"#{rank} EV {entry.ev * 100:+.1f}% | all hit {entry.win_probability * 100:.1f}%", file=sys.stderr)
+        if args.entries:
+            write_frame(entries_frame(board, entries), args.entries)
+
+    print(f"Done in {time.perf_counter() - started:.2f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
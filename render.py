@@ -0,0 +1,69 @@
+from html import escape
+
+from scoring import HIT_RATE_THRESHOLD
+
+# Props per page in the Available Props list
+PAGE_SIZES = [30, 60, 120]
+
+BADGE_CLASSES = {
+    'NBA': 'badge-nba', 'NHL': 'badge-nhl', 'MLB': 'badge-mlb',
+    'Tennis': 'badge-tennis', 'Soccer': 'badge-soccer', 'Golf': 'badge-pga',
+    'Esports': 'badge-esports', 'CBB': 'badge-cbb', 'NASCAR': 'badge-nascar',
+    'Other': 'badge-other'
+}
+
+# Shown in place of a missing name or stat type
+MISSING_TEXT = 'Unknown'
+
+
+def display_text(value):
+    """A board value as text, MISSING_TEXT for None or NaN"""
+    if value is None or value != value:
+        return MISSING_TEXT
+    return str(value)
+
+
+def get_badge_class(sport, is_team):
+    """Get badge class based on sport and whether it's a team prop"""
+    if is_team:
+        return "badge-team"
+    return BADGE_CLASSES.get(sport, 'badge-other')
+
+
+def prop_card_html(emoji, sport, display_name, is_team, stat_type, line, hit_rate, recommendation):
+    """One self-contained prop card"""
+    hit_color = "#2E7D32" if hit_rate > HIT_RATE_THRESHOLD else "#C62828"
+    rec_class = "more-badge" if recommendation == "MORE" else "less-badge"
+    return f"""
+<div class='prop-card'>
+    <div style='display: flex; justify-content: space-between; align-items: center;'>
+        <div>
+            <span style='font-size:1.2rem;'>{emoji}</span>
+            <span style='font-weight:bold; font-size:1.1rem;'>{escape(display_text(display_name))}</span>
+            <span class='{get_badge_class(sport, is_team)}'>{sport}{' TEAM' if is_team else ''}</span>
+        </div>
+        <span style='font-weight:bold; color:{hit_color};'>{hit_rate*100:.1f}%</span>
+    </div>
+    <div class='stat-line'>{escape(display_text(stat_type))}: {line:.1f}</div>
+    <div style='display:flex; gap:10px; align-items:center; margin-top:8px;'>
+        <span class='{rec_class}'>{recommendation}</span>
+    </div>
+</div>"""
+
+
+def prop_cards_html(page):
+    """Card HTML for a whole page of props in one string"""
+    columns = ['emoji', 'sport', 'display_name', 'is_team', 'stat_type', 'line', 'hit_rate', 'recommendation']
+    return "".join(prop_card_html(*values) for values in zip(*(page[c].tolist() for c in columns)))
+
+
+def prop_label(row):
+    """Short label used when picking props from a page"""
+    return f"{display_text(row['display_name'])} · {display_text(row['stat_type'])} {row['line']:.1f} · {row['recommendation']}"
+
+
+def page_bounds(total, page, page_size):
+    """Clamp a page cursor and return it with the slice it covers"""
+    pages = max((total + page_size - 1) // page_size, 1)
+    page = min(max(page, 0), pages - 1)
+    return page, pages, page * page_size, min((page + 1) * page_size, total)
@@ -0,0 +1,228 @@
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+# Requests per rolling hour the per-league refreshes may spend
+HOURLY_BUDGET = int(os.environ.get('PRIZEPICKS_HOURLY_BUDGET', 720))
+# Share of the budget planned intervals aim for; the rest absorbs manual refreshes
+BUDGET_TARGET = 0.8
+
+MIN_INTERVAL = 60
+DEFAULT_INTERVAL = 300
+MAX_INTERVAL = 3600
+
+# (seconds until the league's next game, refresh interval): closer games refresh faster
+START_TIERS = [(30 * 60, 60), (2 * 3600, 150), (8 * 3600, 300), (24 * 3600, 900)]
+# Games that started this recently still count as starting now
+START_GRACE = 15 * 60
+
+# A league nobody is viewing refreshes this many times slower
+UNWATCHED_FACTOR = 4
+
+# Line churn: an EWMA of the share of a league's props that moved per refresh,
+# where a 10% churn halves the interval
+CHURN_ALPHA = 0.3
+CHURN_WEIGHT = 10
+
+
+class LeagueState:
+    """What the scheduler knows about one league"""
+    __slots__ = ('fetched_at', 'forced', 'retry_at', 'failures', 'pages', 'churn', 'starts')
+
+    def __init__(self):
+        self.fetched_at = None
+        self.forced = False
+        self.retry_at = 0.0
+        self.failures = 0
+        self.pages = 1
+        self.churn = 0.0
+        # Sorted game start times, epoch seconds
+        self.starts = np.empty(0)
+
+
+def start_seconds(frame):
+    """Sorted distinct game start times of a raw frame as epoch seconds"""
+    if 'start_time' not in frame:
+        return np.empty(0)
+    starts = pd.to_datetime(frame['start_time'], errors='coerce').dropna()
+    return np.unique(starts.to_numpy('datetime64[ns]').astype(np.int64) / 1e9)
+
+
+def line_churn(old, new):
+    """Share of the new frame's props that are new or moved since the old one"""
+    if old is None or not len(new):
+        return 0.0
+    previous = pd.Series(old['line'].to_numpy(), index=old['projection_id'].to_numpy())
+    previous = previous[~previous.index.duplicated(keep='last')]
+    before = previous.reindex(new['projection_id'].to_numpy()).to_numpy()
+    return float(np.mean(before != new['line'].to_numpy()))
+
+
+class RefreshScheduler:
+    """Gives every league its own refresh interval under a shared request budget.
+
+    A league's interval shrinks as its next game gets closer and as its
+    lines move more, and grows while no session is viewing it. When the
+    planned intervals would spend more than the hourly budget they are
+    stretched together, and requests actually made in the last hour cap
+    what due() hands out.
+    """
+
+    def __init__(self, budget=HOURLY_BUDGET):
+        self.budget = budget
+        self.states = {}
+        self.requests = deque()
+        self._lock = threading.Lock()
+
+    def _state(self, league_id):
+        state = self.states.get(league_id)
+        if state is None:
+            state = self.states[league_id] = LeagueState()
+        return state
+
+    def spent(self, now=None):
+        """Requests made in the last hour"""
+        now = time.time() if now is None else now
+        with self._lock:
+            return self._spent(now)
+
+    def _spent(self, now):
+        while self.requests and now - self.requests[0][0] >= 3600:
+            self.requests.popleft()
+        return sum(count for _, count in self.requests)
+
+    def base_interval(self, state, watched, now):
+        """Interval from start times, churn and viewers, before the budget"""
+        upcoming = state.starts[np.searchsorted(state.starts, now - START_GRACE):]
+        if len(upcoming):
+            until = upcoming[0] - now
+            interval = next((seconds for limit, seconds in START_TIERS if until < limit), MAX_INTERVAL)
+        else:
+            interval = DEFAULT_INTERVAL
+        interval /= 1 + CHURN_WEIGHT * state.churn
+        if not watched:
+            interval *= UNWATCHED_FACTOR
+        return min(max(interval, MIN_INTERVAL), MAX_INTERVAL)
+
+    def intervals(self, leagues, watched, now):
+        """Planned seconds between refreshes per league, stretched to fit the budget"""
+        intervals = {
+            league_id: self.base_interval(self._state(league_id), league_id in watched, now) for league_id in leagues
+        }
+        demand = sum(self._state(league_id).pages * 3600 / interval for league_id, interval in intervals.items())
+        stretch = max(1.0, demand / (self.budget * BUDGET_TARGET))
+        return {league_id: interval * stretch for league_id, interval in intervals.items()}
+
+    def due(self, leagues, watched, now=None):
+        """Leagues to fetch now, most overdue first, within what is left of the budget"""
+        now = time.time() if now is None else now
+        watched = set(watched)
+        with self._lock:
+            intervals = self.intervals(leagues, watched, now)
+            lateness = {}
+            for league_id, interval in intervals.items():
+                state = self.states[league_id]
+                if now < state.retry_at:
+                    continue
+                if state.fetched_at is None or state.forced:
+                    lateness[league_id] = float('inf')
+                elif now - state.fetched_at >= interval:
+                    lateness[league_id] = (now - state.fetched_at) / interval
+            left = self.budget - self._spent(now)
+            due = []
+            for league_id in sorted(lateness, key=lateness.get, reverse=True):
+                left -= self.states[league_id].pages
+                if left < 0:
+                    break
+                due.append(league_id)
+            return due
+
+    def next_wakeup(self, leagues, watched, now=None):
+        """Seconds until the next league falls due, at least MIN_INTERVAL / 4"""
+        now = time.time() if now is None else now
+        with self._lock:
+            intervals = self.intervals(leagues, set(watched), now)
+            times = []
+            for league_id, interval in intervals.items():
+                state = self.states[league_id]
+                due_at = now if state.fetched_at is None or state.forced else state.fetched_at + interval
+                times.append(max(due_at, state.retry_at))
+            wait = min(times) - now if times else DEFAULT_INTERVAL
+            if self._spent(now) >= self.budget and self.requests:
+                # Nothing can go out until the oldest request leaves the window
+                wait = max(wait, self.requests[0][0] + 3600 - now)
+        return max(wait, MIN_INTERVAL / 4)
+
+    def expire(self, leagues):
+        """Make these leagues due on the next pass, e.g. after a manual refresh"""
+        with self._lock:
+            for league_id in leagues:
+                state = self._state(league_id)
+                state.forced = True
+                state.retry_at = 0.0
+
+    def untried(self, leagues):
+        """The leagues that have never been fetched or failed"""
+        with self._lock:
+            return [
+                league_id for league_id in leagues
+                if league_id not in self.states or (self.states[league_id].fetched_at is None and not self.states[league_id].failures)
+            ]
+
+    def fetched(self, league_id, frame, pages, churn, now=None):
+        """Record a successful fetch of a league"""
+        now = time.time() if now is None else now
+        with self._lock:
+            state = self._state(league_id)
+            state.churn = churn if state.fetched_at is None else \
+                CHURN_ALPHA * churn + (1 - CHURN_ALPHA) * state.churn
+            state.fetched_at = now
+            state.forced = False
+            state.retry_at = 0.0
+            state.failures = 0
+            state.pages = max(pages, 1)
+            state.starts = start_seconds(frame)
+            self.requests.append((now, pages))
+
+    def spend(self, requests=1, now=None):
+        """Count requests made outside the per-league fetches against the budget"""
+        now = time.time() if now is None else now
+        with self._lock:
+            self.requests.append((now, requests))
+
+    def failed(self, league_id, backoff, now=None):
+        """Record a failed fetch; backoff maps the league's consecutive failures to a retry delay"""
+        now = time.time() if now is None else now
+        with self._lock:
+            state = self._state(league_id)
+            state.failures += 1
+            state.forced = False
+            state.retry_at = now + backoff(state.failures)
+            self.requests.append((now, 1))
+
+    def status(self, leagues, watched, now=None):
+        """One row per league: planned interval, seconds until due, next game and churn"""
+        now = time.time() if now is None else now
+        watched = set(watched)
+        with self._lock:
+            intervals = self.intervals(leagues, watched, now)
+            rows = []
+            for league_id, interval in intervals.items():
+                state = self.states[league_id]
+                upcoming = state.starts[np.searchsorted(state.starts, now - START_GRACE):]
+                due_at = now if state.fetched_at is None or state.forced else state.fetched_at + interval
+                rows.append({
+                    'league_id': league_id,
+                    'watched': league_id in watched,
+                    'interval_s': round(interval),
+                    'due_in_s': round(max(due_at, state.retry_at) - now),
+                    'next_game_min': round((upcoming[0] - now) / 60) if len(upcoming) else None,
+                    'churn': round(state.churn, 3),
+                    'pages': state.pages,
+                    'failures': state.failures,
+                })
+        return pd.DataFrame(rows)
@@ -0,0 +1,121 @@
+import re
+import unicodedata
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# Board columns searched and how much a match in each counts
+SEARCH_FIELDS = {'player_name': 1.0, 'display_name': 1.0, 'team_code': 0.6, 'stat_type': 0.8}
+
+# Match quality of one query word against one indexed word
+PREFIX_SCORE = 1.0
+WORD_SCORE = 2.0
+# Extra credit when the whole query equals a field, e.g. a full name
+EXACT_BONUS = 2.0
+
+MAX_RESULTS = 200
+
+# Folded strings remembered across snapshots; names repeat from one board to the next
+FOLD_CACHE_SIZE = 65536
+
+_SEPARATORS = re.compile(r'[^0-9a-z]+')
+
+
+@lru_cache(maxsize=FOLD_CACHE_SIZE)
+def fold(text):
+    """Lowercase ASCII words of a string: accents stripped, punctuation dropped"""
+    decomposed = unicodedata.normalize('NFKD', text)
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(_SEPARATORS.split(stripped.casefold())).strip()
+
+
+def _field_terms(series):
+    """Row codes and distinct values of a column, reusing categorical codes"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), series.cat.categories.to_numpy(dtype=object)
+    return pd.factorize(series.to_numpy(dtype=object), use_na_sentinel=True)
+
+
+class SearchIndex:
+    """Accent-insensitive word-prefix index over the board's name columns.
+
+    Every distinct folded value of a searched column is a term; the words
+    of all terms are kept in one sorted array, so the terms a query word
+    is a prefix of are a searchsorted range. Terms map back to board
+    positions through a CSR layout. Build it once per snapshot version.
+    """
+
+    def __init__(self, board):
+        self.size = len(board)
+        hit_rate = board['hit_rate'].to_numpy()
+        # Hit-rate rank per position, to break score ties best-first
+        self.rank = np.empty(self.size, dtype=np.int64)
+        self.rank[np.argsort(-hit_rate, kind='stable')] = np.arange(self.size)
+
+        terms, weights, term_codes, words, word_terms = [], [], [], [], []
+        for name, weight in SEARCH_FIELDS.items():
+            if name not in board:
+                continue
+            codes, values = _field_terms(board[name])
+            offset = len(terms)
+            for value in values:
+                folded = fold(str(value))
+                for word in folded.split():
+                    words.append(word)
+                    word_terms.append(len(terms))
+                terms.append(folded)
+                weights.append(weight)
+            codes = codes.astype(np.int64)
+            term_codes.append(np.where(codes >= 0, codes + offset, -1))
+
+        self.terms = np.array(terms, dtype=object)
+        self.weights = np.array(weights)
+        order = np.argsort(np.array(words, dtype=str), kind='stable')
+        self.words = np.array(words, dtype=str)[order]
+        self.word_terms = np.array(word_terms, dtype=np.int64)[order]
+
+        # CSR: rows of term t are positions[starts[t]:starts[t + 1]]
+        row_terms = np.concatenate(term_codes) if term_codes else np.empty(0, dtype=np.int64)
+        row_positions = np.tile(np.arange(self.size), len(term_codes))
+        valid = row_terms >= 0
+        row_terms, row_positions = row_terms[valid], row_positions[valid]
+        by_term = np.argsort(row_terms, kind='stable')
+        self.positions = row_positions[by_term]
+        self.starts = np.searchsorted(row_terms[by_term], np.arange(len(terms) + 1))
+
+    def _word_scores(self, word):
+        """Best score per term for one query word"""
+        lo = np.searchsorted(self.words, word, side='left')
+        hi = np.searchsorted(self.words, word + '\U0010ffff', side='left')
+        terms = self.word_terms[lo:hi]
+        quality = np.where(self.words[lo:hi] == word, WORD_SCORE, PREFIX_SCORE)
+        scores = np.zeros(len(self.terms))
+        np.maximum.at(scores, terms, quality)
+        return scores
+
+    def _row_scores(self, term_scores):
+        """Best term score per board position"""
+        terms = np.flatnonzero(term_scores)
+        counts = self.starts[terms + 1] - self.starts[terms]
+        # Gather every position of every matched term in one pass
+        offsets = np.repeat(self.starts[terms] - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        scores = np.zeros(self.size)
+        np.maximum.at(scores, self.positions[offsets], np.repeat(term_scores[terms] * self.weights[terms], counts))
+        return scores
+
+    def search(self, query, limit=MAX_RESULTS):
+        """Board positions matching every word of the query, best match first"""
+        folded = fold(query)
+        if not folded:
+            return np.empty(0, dtype=np.intp)
+        total = np.zeros(self.size)
+        matched = np.ones(self.size, dtype=bool)
+        for word in folded.split():
+            scores = self._row_scores(self._word_scores(word))
+            matched &= scores > 0
+            total += scores
+        total += EXACT_BONUS * self._row_scores((self.terms == folded).astype(np.float64))
+        hits = np.flatnonzero(matched)
+        order = np.lexsort((self.rank[hits], -total[hits]))
+        return hits[order[:limit]] if limit else hits[order]
@@ -0,0 +1,99 @@
+from dataclasses import dataclass
+
+import numpy as np
+from scipy.stats import norm
+
+from optimizer import PAYOUT_TABLES, payout_vector
+
+DEFAULT_SIMULATIONS = 1_000_000
+# Rows drawn per batch; memory stays at CHUNK_SIZE x legs normals
+CHUNK_SIZE = 200_000
+
+# Latent correlation between legs that share a game or team
+SAME_GROUP_CORRELATION = 0.25
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+@dataclass(frozen=True)
+class SimulationResult:
+    """Payout distribution of one entry under one payout table"""
+    mode: str
+    entry_amount: float
+    expected_payout: float
+    prob_profit: float
+    percentiles: dict
+
+    @property
+    def ev(self):
+        """Expected profit in dollars"""
+        return self.expected_payout - self.entry_amount
+
+
+def correlation_matrix(groups, directions, rho=SAME_GROUP_CORRELATION):
+    """Latent correlation for legs; LESS legs move against MORE legs.
+
+    groups holds each leg's group keys, e.g. ('team', code) and ('game', id);
+    legs sharing any key are correlated and None keys are ignored.
+    """
+    n = len(groups)
+    keys = [{key for key in leg_keys or () if key is not None} for leg_keys in groups]
+    corr = np.eye(n)
+    for i in range(n):
+        for j in range(i + 1, n):
+            if keys[i] & keys[j]:
+                corr[i, j] = corr[j, i] = rho * directions[i] * directions[j]
+    return corr
+
+
+def simulate_hit_counts(probabilities, corr=None, simulations=DEFAULT_SIMULATIONS,
+                        seed=None, chunk_size=CHUNK_SIZE):
+    """Distribution of legs hit, drawn through a Gaussian copula"""
+    probabilities = np.asarray(probabilities, dtype=np.float64)
+    n = len(probabilities)
+    thresholds = norm.ppf(probabilities)
+    chol = np.linalg.cholesky(corr if corr is not None else np.eye(n))
+
+    rng = np.random.default_rng(seed)
+    counts = np.zeros(n + 1, dtype=np.int64)
+    remaining = simulations
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        latent = rng.standard_normal((size, n)) @ chol.T
+        hits = np.count_nonzero(latent < thresholds, axis=1)
+        counts += np.bincount(hits, minlength=n + 1)
+        remaining -= size
+    return counts / simulations
+
+
+def summarize(hit_dist, entry_amount, mode):
+    """EV, chance of profit and payout percentiles for a hit-count distribution"""
+    payouts = entry_amount * payout_vector(len(hit_dist) - 1, mode)
+    order = np.argsort(payouts, kind='stable')
+    cdf = np.cumsum(hit_dist[order])
+    percentiles = {
+        q: float(payouts[order][min(np.searchsorted(cdf, q / 100), len(cdf) - 1)])
+        for q in PERCENTILES
+    }
+    return SimulationResult(
+        mode=mode,
+        entry_amount=entry_amount,
+        expected_payout=float(hit_dist @ payouts),
+        prob_profit=float(hit_dist[payouts > entry_amount].sum()),
+        percentiles=percentiles,
+    )
+
+
+def simulate_entry(probabilities, groups=None, directions=None, entry_amount=10.0,
+                   simulations=DEFAULT_SIMULATIONS, seed=None, rho=SAME_GROUP_CORRELATION):
+    """Simulate an entry once and summarize it for every payout table that fits"""
+    n = len(probabilities)
+    groups = groups if groups is not None else [None] * n
+    directions = directions if directions is not None else [1] * n
+    hit_dist = simulate_hit_counts(
+        probabilities, correlation_matrix(groups, directions, rho), simulations, seed
+    )
+    return {
+        mode: summarize(hit_dist, entry_amount, mode)
+        for mode, table in PAYOUT_TABLES.items() if n in table
+    }
@@ -0,0 +1,129 @@
+import threading
+from dataclasses import dataclass
+
+import pandas as pd
+
+from compact import concat_boards, widen
+
+# Columns that come from the payload, its included resources among them;
+# a change in any of them means the row has to be re-derived
+RAW_COLUMNS = ['league_id', 'player_name', 'line', 'stat_type', 'team', 'position', 'opponent', 'game_id', 'start_time']
+
+
+@dataclass(frozen=True)
+class ChangeSet:
+    """Projection ids that differ between two consecutive snapshots"""
+    version: int
+    added: pd.Index
+    removed: pd.Index
+    changed: pd.Index
+    # New line minus previous line for changed ids whose line moved
+    line_moves: pd.Series
+
+    @property
+    def is_empty(self):
+        return not (len(self.added) or len(self.removed) or len(self.changed))
+
+    @property
+    def touched(self):
+        """Ids whose derived columns were recomputed"""
+        return self.added.append(self.changed)
+
+    def describe(self):
+        return f"+{len(self.added):,} new, -{len(self.removed):,} removed, {len(self.changed):,} changed ({len(self.line_moves):,} line moves)"
+
+
+def row_fingerprints(raw):
+    """One hash per row over the RAW_COLUMNS present; missing values hash alike"""
+    columns = [name for name in RAW_COLUMNS if name in raw]
+    return pd.util.hash_pandas_object(raw[columns], index=False)
+
+
+def _empty_change_set(version):
+    empty = pd.Index([], name='projection_id')
+    return ChangeSet(version, empty, empty, empty, pd.Series([], dtype='float64'))
+
+
+class SnapshotStore:
+    """Derived board keyed by projection id, updated from payload deltas.
+
+    derive takes a raw frame indexed by projection_id and returns it with
+    the derived columns added; it is only called on added or changed rows.
+    One board per version is shared by every caller: update hands out
+    shallow views, which under pandas copy-on-write cost no copy and keep a
+    caller's writes private to its own view.
+
+    Listeners added with subscribe are called as (board, changes,
+    source_key) for every new version, in order and exactly once, whichever
+    caller triggered the update.
+    """
+
+    def __init__(self, derive):
+        self.derive = derive
+        self.listeners = []
+        self.board = None
+        # Row fingerprints of the raw frame behind the board
+        self.fingerprints = None
+        self.version = 0
+        self.source_key = None
+        self.changes = _empty_change_set(0)
+        self._lock = threading.Lock()
+
+    def subscribe(self, listener):
+        """Call listener(board, changes, source_key) after every applied update"""
+        with self._lock:
+            self.listeners.append(listener)
+
+    def update(self, raw, source_key=None):
+        """Diff a raw projections frame against the current board and apply it"""
+        with self._lock:
+            if self.board is not None and source_key is not None and source_key == self.source_key:
+                return self.board.copy(deep=False), self.changes
+
+            raw = raw.drop_duplicates('projection_id', keep='last').set_index('projection_id')
+            fingerprints = row_fingerprints(raw)
+
+            if self.board is None:
+                board = self.derive(raw)
+                changes = ChangeSet(
+                    self.version + 1, raw.index, raw.index[:0], raw.index[:0],
+                    pd.Series([], dtype='float64'),
+                )
+            else:
+                board, changes = self._apply_delta(raw, fingerprints)
+
+            if changes.is_empty:
+                changes = _empty_change_set(self.version)
+            else:
+                self.version = changes.version
+            self.board = board
+            self.fingerprints = fingerprints
+            self.source_key = source_key
+            self.changes = changes
+            if not changes.is_empty:
+                for listener in self.listeners:
+                    listener(board, changes, source_key)
+            return self.board.copy(deep=False), self.changes
+
+    def _apply_delta(self, raw, fingerprints):
+        old = self.board
+        added = raw.index.difference(old.index, sort=False)
+        removed = old.index.difference(raw.index, sort=False)
+        common = raw.index.intersection(old.index, sort=False)
+
+        differs = fingerprints[common].to_numpy() != self.fingerprints[common].to_numpy()
+        changed = common[differs]
+
+        line_delta = pd.Series(
+            widen(raw.loc[changed, 'line']) - widen(old.loc[changed, 'line']), index=changed,
+        )
+        line_moves = line_delta[line_delta != 0]
+
+        changes = ChangeSet(self.version + 1, added, removed, changed, line_moves)
+        if changes.is_empty:
+            return old, changes
+
+        kept = old.loc[common[~differs]]
+        fresh = self.derive(raw.loc[changes.touched])
+        board = concat_boards([kept, fresh])
+        return board.reindex(raw.index), changes
@@ -0,0 +1,59 @@
+from dataclasses import dataclass
+
+import pandas as pd
+
+# Count columns in the per-league and per-sport tables
+COUNT_COLUMNS = ['total', 'players', 'teams', 'more', 'less']
+
+
+@dataclass(frozen=True)
+class BoardSummary:
+    """Counts every widget needs, computed once per snapshot version"""
+    version: int
+    total: int
+    players: int
+    teams: int
+    more: int
+    less: int
+    # Indexed by league_id (with its sport) and by sport, largest first
+    by_league: pd.DataFrame
+    by_sport: pd.DataFrame
+
+
+def _count_table(counts, level):
+    """Collapse the grouped counts to one row per value of level"""
+    by_team = counts.groupby(level=[level, 'is_team'], sort=False, observed=True).sum().unstack('is_team', fill_value=0)
+    by_rec = counts.groupby(level=[level, 'recommendation'], sort=False, observed=True).sum().unstack('recommendation', fill_value=0)
+    table = pd.DataFrame({
+        'players': by_team.get(False, 0),
+        'teams': by_team.get(True, 0),
+        'more': by_rec.get('MORE', 0),
+        'less': by_rec.get('LESS', 0),
+    }).fillna(0).astype('int64')
+    table.insert(0, 'total', table['players'] + table['teams'])
+    return table.sort_values('total', ascending=False, kind='stable')
+
+
+def summarize_board(board, version=0):
+    """All board counts from a single groupby pass over the frame"""
+    if board.empty:
+        empty = pd.DataFrame(columns=COUNT_COLUMNS, dtype='int64')
+        return BoardSummary(version, 0, 0, 0, 0, 0, empty, empty)
+
+    counts = board.groupby(['league_id', 'sport', 'is_team', 'recommendation'], sort=False, observed=True).size()
+    by_league = _count_table(counts, 'league_id')
+    league_sport = counts.index.to_frame(index=False).drop_duplicates('league_id').set_index('league_id')['sport']
+    by_league.insert(0, 'sport', league_sport.reindex(by_league.index))
+
+    by_sport = _count_table(counts, 'sport')
+    totals = by_sport.sum()
+    return BoardSummary(
+        version=version,
+        total=int(totals['total']),
+        players=int(totals['players']),
+        teams=int(totals['teams']),
+        more=int(totals['more']),
+        less=int(totals['less']),
+        by_league=by_league,
+        by_sport=by_sport,
+    )